@@ -11,6 +11,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from src.monitors.fill_monitor import FillMonitor
+from src.utils.event_loop import install_uvloop
 
 
 class SimpleTradingEngine:
@@ -39,4 +40,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main())
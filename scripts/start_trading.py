@@ -11,6 +11,7 @@ import signal
 import sys
 import os
 import fcntl
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any
 
@@ -19,9 +20,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.settings import settings
 from src.core.strategy_engine import MultiAssetStrategyEngine, MarketData
+from src.core.indicators import ema_last
 from src.exchange.bybit_client import BybitClient
+from src.exchange.bybit_ws import BybitWS
 from src.notifications.telegram_bot import telegram_bot, notify_trade_entry, notify_trade_exit, send_daily_report, notify_regime_change
 from src.integration.alpha_integration import get_integration
+from src.utils.event_loop import install_uvloop
 
 # Configure logging with daily rotation (UTC+0)
 def setup_logging():
@@ -71,9 +75,11 @@ logger = logging.getLogger(__name__)
 class MultiAssetTradingSystem:
     def __init__(self):
         self.strategy_engine = MultiAssetStrategyEngine()
-        self.bybit_client = BybitClient()
-        self.running = False
         self.assets = settings.get_asset_symbols()
+        # Tickers and 5-minute klines stream over WebSocket; the client falls back to REST when needed
+        self.bybit_ws = BybitWS([f"{asset}USDT" for asset in self.assets], kline_interval='5')
+        self.bybit_client = BybitClient(ws=self.bybit_ws)
+        self.running = False
         self.lock_file = None
         self.last_daily_reset = datetime.now(timezone.utc).date()
         self.account_balance = 0.0  # Cache balance from session startup
@@ -90,14 +96,16 @@ class MultiAssetTradingSystem:
         logger.info(f"Assets: {', '.join(self.assets)}")
         
         try:
+            # Start market data streams and load instrument specs in one bulk request
+            await self.bybit_ws.start()
+            await self.bybit_client.initialize([f"{asset}USDT" for asset in self.assets])
+            
             # Test exchange connection and cache account balance
             balance_info = await self.bybit_client.get_account_balance()
             if balance_info and 'list' in balance_info:
-                for account in balance_info['list']:
-                    for coin in account.get('coin', []):
-                        if coin.get('coin') == 'USDT':
-                            self.account_balance = float(coin.get('walletBalance', 0))
-                            break
+                usdt = BybitClient.get_coin_balance(balance_info, 'USDT')
+                if usdt is not None:
+                    self.account_balance = float(usdt.get('walletBalance', 0))
             else:
                 self.account_balance = 10000.0  # Default for testing
             
@@ -136,18 +144,8 @@ class MultiAssetTradingSystem:
                 logger.info("📱 Telegram notifications disabled")
             
             # Initialize instrument specifications and set leverage for all assets
-            for asset in self.assets:
-                symbol = f"{asset}USDT"
-                try:
-                    # Fetch instrument specifications
-                    await self.bybit_client.get_instrument_info(symbol)
-                    logger.info(f"✅ {asset}: Instrument specifications loaded")
-                    
-                    # Set leverage
-                    await self.bybit_client.set_leverage(symbol, "10", "10")
-                    logger.info(f"✅ {asset}: Leverage set to 10x")
-                except Exception as e:
-                    logger.warning(f"⚠️ {asset}: Failed to set leverage: {e}")
+            # (independent per symbol, so done concurrently)
+            await asyncio.gather(*(self.prepare_asset(asset) for asset in self.assets))
             
             # Initialize positions
             await self.sync_positions()
@@ -159,12 +157,30 @@ class MultiAssetTradingSystem:
             logger.error(f"❌ System initialization failed: {e}")
             return False
     
+    async def prepare_asset(self, asset: str):
+        """Load instrument specifications and set leverage for one asset"""
+        symbol = f"{asset}USDT"
+        try:
+            # Fetch instrument specifications if the bulk preload missed them
+            if symbol not in self.bybit_client.instrument_specs:
+                await self.bybit_client.get_instrument_info(symbol)
+            logger.info(f"✅ {asset}: Instrument specifications loaded")
+            
+            # Set leverage
+            await self.bybit_client.set_leverage(symbol, "10", "10")
+            logger.info(f"✅ {asset}: Leverage set to 10x")
+        except Exception as e:
+            logger.warning(f"⚠️ {asset}: Failed to set leverage: {e}")
+    
     async def sync_positions(self):
         """Synchronize positions with exchange"""
         try:
+            # One query for every USDT position instead of one per asset
+            all_positions = await self.bybit_client.get_all_positions('USDT')
+            
             for asset in self.assets:
                 symbol = f"{asset}USDT"
-                positions = await self.bybit_client.get_positions(symbol)
+                positions = all_positions.get(symbol, [])
                 
                 for position in positions:
                     if float(position.get('size', 0)) != 0:
@@ -221,17 +237,16 @@ class MultiAssetTradingSystem:
             symbol = f"{asset}USDT"
             
             # Get 5-minute klines for EMA calculation (need enough for 600 EMA)
-            klines = await self.bybit_client.get_klines(symbol, '5', 1000)
+            # Columns come back as arrays in chronological order (oldest first)
+            bars = await self.bybit_client.get_kline_arrays(symbol, '5', 1000)
             
-            if not klines or len(klines) < 600:
-                raise ValueError(f"Insufficient 5-minute bar data for {asset} - need 600+ bars, got {len(klines)}")
+            if len(bars['close']) < 600:
+                raise ValueError(f"Insufficient 5-minute bar data for {asset} - need 600+ bars, got {len(bars['close'])}")
             
-            # Bybit returns klines in reverse chronological order (newest first)
-            # Format: [startTime, openPrice, highPrice, lowPrice, closePrice, volume, turnover]
-            closes = [float(kline[4]) for kline in reversed(klines)]  # Reverse to get chronological order
+            closes = bars['close']
             
             # Verify we have proper 5-minute intervals
-            latest_bar_time = int(klines[0][0])  # Most recent bar timestamp
+            latest_bar_time = int(bars['ts'][-1])  # Most recent bar timestamp
             current_time_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
             
             # Check if latest bar is within last 5 minutes (allowing some delay)
@@ -240,14 +255,14 @@ class MultiAssetTradingSystem:
                 logger.warning(f"{asset}: Latest 5-min bar is {time_diff_minutes:.1f} minutes old")
             
             # Use the close price of the most recent completed bar
-            current_price = closes[-1]  # Last close price from completed bars
+            current_price = float(closes[-1])  # Last close price from completed bars
             
             # Calculate EMAs using completed bars only (exclude current incomplete bar if any)
             ema_240 = self.calculate_ema(closes, 240)
             ema_600 = self.calculate_ema(closes, 600)
             
             # Get volume from latest completed bar
-            volume = float(klines[0][5])  # Volume of most recent bar
+            volume = float(bars['volume'][-1])  # Volume of most recent bar
             
             logger.debug(f"{asset}: Processed {len(closes)} 5-min bars - "
                         f"Price: ${current_price:.4f}, EMA240: ${ema_240:.4f}, EMA600: ${ema_600:.4f}")
@@ -265,18 +280,9 @@ class MultiAssetTradingSystem:
             logger.error(f"Failed to get market data for {asset}: {e}")
             raise
     
-    def calculate_ema(self, prices: list, period: int) -> float:
-        """Calculate Exponential Moving Average"""
-        if len(prices) < period:
-            return sum(prices) / len(prices)  # Fallback to SMA if not enough data
-        
-        multiplier = 2 / (period + 1)
-        ema = sum(prices[:period]) / period  # Start with SMA
-        
-        for price in prices[period:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-        
-        return ema
+    def calculate_ema(self, prices, period: int) -> float:
+        """Calculate Exponential Moving Average (SMA-seeded; SMA if fewer than period prices)"""
+        return ema_last(prices, period)
     
     async def execute_signal(self, signal):
         """Execute trading signal with real-time balance validation"""
@@ -292,12 +298,9 @@ class MultiAssetTradingSystem:
             balance_info = await self.bybit_client.get_account_balance()
             current_balance = self.account_balance  # Default to cached balance
             
-            if balance_info and 'list' in balance_info:
-                for account in balance_info['list']:
-                    for coin in account.get('coin', []):
-                        if coin.get('coin') == 'USDT':
-                            current_balance = float(coin.get('walletBalance', 0))
-                            break
+            usdt = BybitClient.get_coin_balance(balance_info, 'USDT')
+            if usdt is not None:
+                current_balance = float(usdt.get('walletBalance', 0))
             
             logger.info(f"💰 {asset}: Current balance for validation: ${current_balance:,.2f} USDT")
             
@@ -381,7 +384,7 @@ class MultiAssetTradingSystem:
                     await asyncio.sleep(1)
                     
                     # Re-fetch instrument specs in case they changed
-                    await self.bybit_client.get_instrument_info(symbol)
+                    await self.bybit_client.get_instrument_info(symbol, refresh=True)
                     
                     # Re-validate with updated specs
                     validation = self.bybit_client.validate_order_params(symbol, raw_quantity, signal.price)
@@ -471,13 +474,18 @@ class MultiAssetTradingSystem:
                 
                 # Check exit conditions
                 should_exit, exit_reason = self.strategy_engine.should_exit_position(
-                    asset, current_price, datetime.now(timezone.utc), current_regime
+                    asset, current_price, time.time(), current_regime
                 )
                 
                 if should_exit:
                     try:
                         # Close position
-                        await self.bybit_client.close_position(symbol)
+                        result = await self.bybit_client.close_position(symbol)
+                        if result.get('status') == 'no_position':
+                            # Already flat on the exchange (e.g. TP/SL filled); nothing was sold here
+                            logger.warning(f"⚠️ {asset}: No open position on exchange, marking flat without recording an exit")
+                            self.strategy_engine.update_position(asset, False)
+                            continue
                         
                         # Get position data for P&L calculation
                         position_data = self.strategy_engine.asset_positions[asset]
@@ -551,32 +559,34 @@ class MultiAssetTradingSystem:
             return
         
         try:
-            # Get fresh account balance from Bybit
+            # Balance, daily P&L and trade count are independent requests; fetch them concurrently
+            balance_info, daily_pnl, total_trades = await asyncio.gather(
+                self.bybit_client.get_account_balance(),
+                self.bybit_client.get_daily_pnl(),
+                self.bybit_client.get_trade_count_today(),
+                return_exceptions=True
+            )
+            
+            # Fresh account balance from Bybit
             try:
-                balance_info = await self.bybit_client.get_account_balance()
+                if isinstance(balance_info, BaseException):
+                    raise balance_info
                 current_balance = 0.0
-                if balance_info and 'list' in balance_info:
-                    for account in balance_info['list']:
-                        if account.get('accountType') == 'UNIFIED':
-                            coins = account.get('coin', [])
-                            for coin in coins:
-                                if coin.get('coin') == 'USDT':
-                                    current_balance = float(coin.get('walletBalance', 0))
-                                    break
-                            break
+                usdt = BybitClient.get_coin_balance(balance_info, 'USDT', account_type='UNIFIED')
+                if usdt is not None:
+                    current_balance = float(usdt.get('walletBalance', 0))
                 logger.info(f"💰 Fresh account balance retrieved: ${current_balance:,.2f} USDT")
             except Exception as e:
                 logger.error(f"Failed to get fresh account balance: {e}")
                 current_balance = self.account_balance  # Fall back to cached balance
             
-            # Get daily P&L and trade count from Bybit V5 API
-            try:
-                daily_pnl = await self.bybit_client.get_daily_pnl()
-                total_trades = await self.bybit_client.get_trade_count_today()
-            except Exception as e:
-                logger.error(f"Failed to get daily P&L or trade count: {e}")
-                daily_pnl = 0.0
-                total_trades = 0
+            # Daily P&L and trade count from Bybit V5 API
+            for result in (daily_pnl, total_trades):
+                if isinstance(result, BaseException):
+                    logger.error(f"Failed to get daily P&L or trade count: {result}")
+                    daily_pnl = 0.0
+                    total_trades = 0
+                    break
             
             status_data = {
                 'balance': current_balance,  # Use fresh balance from Bybit
@@ -640,11 +650,13 @@ class MultiAssetTradingSystem:
                 for asset in self.assets:
                     try:
                         market_data = await self.get_market_data(asset)
-                        signal = self.strategy_engine.generate_asset_signal(market_data)
+                        # Signal and regime change from a single pass over the bar
+                        tick = self.strategy_engine.process_tick(market_data, with_alerts=False)
+                        signal = tick.signal
                         signals[asset] = signal
                         
                         # Check for regime changes (but don't notify yet)
-                        regime_change = self.strategy_engine.check_regime_change(market_data)
+                        regime_change = tick.regime_change
                         if regime_change['changed']:
                             regime_changes[asset] = regime_change
                             logger.info(f"📊 {asset}: Regime changed from {regime_change['previous_regime']} → {regime_change['current_regime']} (notification will be sent only if trade is executed)")
@@ -779,7 +791,18 @@ class MultiAssetTradingSystem:
         except Exception as e:
             logger.error(f"System error: {e}")
         finally:
-            self.release_lock()
+            # Run every shutdown step even if an earlier one fails, and always release the lock
+            try:
+                for name, close in (('fill queue', self.alpha_integration.flush),
+                                    ('Telegram bot', telegram_bot.aclose),
+                                    ('Bybit WebSocket', self.bybit_ws.close),
+                                    ('Bybit client', self.bybit_client.close)):
+                    try:
+                        await close()
+                    except Exception as e:
+                        logger.error(f"Error closing {name}: {e}")
+            finally:
+                self.release_lock()
             logger.info("🔴 Multi-Asset Trading System stopped")
 
 async def main():
@@ -788,4 +811,5 @@ async def main():
     await system.run()
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main())
\ No newline at end of file
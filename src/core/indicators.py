@@ -0,0 +1,26 @@
+"""
+Technical indicators computed on NumPy price arrays
+"""
+
+import numpy as np
+
+def ema_last(prices, period: int) -> float:
+    """Latest Exponential Moving Average value of prices (oldest first)
+
+    Seeded with the SMA of the first `period` prices, then updated per price with
+    ema = price * k + ema * (1 - k), k = 2 / (period + 1). The final value of that
+    recurrence is computed in one pass as a weighted sum: the seed decays by (1 - k)^m
+    over the remaining m prices, and the j-th from last of them is weighted k * (1 - k)^j.
+    Falls back to the SMA of all prices when there are fewer than `period`.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    if len(prices) < period:
+        return float(prices.mean())
+
+    multiplier = 2 / (period + 1)
+    decay = 1 - multiplier
+    ema = prices[:period].mean()
+
+    rest = prices[period:]
+    weights = multiplier * decay ** np.arange(len(rest) - 1, -1, -1, dtype=np.float64)
+    return float(ema * decay ** len(rest) + weights @ rest)
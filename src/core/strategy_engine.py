@@ -5,6 +5,7 @@ Handles EMA crossover signals and position management
 """
 
 import logging
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
@@ -55,108 +56,80 @@ class TradingSignal:
     reason: str = ""
     metadata: Optional[Dict[str, Any]] = None
 
+@dataclass
+class TickResult:
+    signal: TradingSignal
+    regime_change: Dict[str, Any]
+    cross_events: List[Dict[str, Any]]
+    alerts: List[MarketAlert]
+
+# Assets tracked by the engine; per-asset state is built from this tuple
+ASSETS = ('BTC', 'ETH', 'SOL')
+
 class MultiAssetStrategyEngine:
     def __init__(self):
         self.asset_positions = {
-            'BTC': {'in_position': False, 'entry_price': 0, 'asset_amount': 0, 'leveraged_value': 0, 'entry_time': None},
-            'ETH': {'in_position': False, 'entry_price': 0, 'asset_amount': 0, 'leveraged_value': 0, 'entry_time': None},
-            'SOL': {'in_position': False, 'entry_price': 0, 'asset_amount': 0, 'leveraged_value': 0, 'entry_time': None}
-        }
-        self.current_regimes = {
-            'BTC': MarketRegime.ACTIVE,
-            'ETH': MarketRegime.ACTIVE, 
-            'SOL': MarketRegime.ACTIVE
-        }
-        self.previous_prices = {
-            'BTC': None,
-            'ETH': None,
-            'SOL': None
-        }
-        self.previous_emas = {
-            'BTC': {'ema_240': None, 'ema_600': None},
-            'ETH': {'ema_240': None, 'ema_600': None},
-            'SOL': {'ema_240': None, 'ema_600': None}
-        }
-        self.recent_cross_events = {
-            'BTC': [],
-            'ETH': [],
-            'SOL': []
-        }
-        self.daily_cross_count = {
-            'BTC': 0,
-            'ETH': 0,
-            'SOL': 0
+            asset: {'in_position': False, 'entry_price': 0, 'asset_amount': 0, 'leveraged_value': 0,
+                    'entry_time': None, 'entry_time_epoch': 0.0}
+            for asset in ASSETS
         }
+        self.current_regimes = {asset: MarketRegime.ACTIVE for asset in ASSETS}
+        self.previous_prices = {asset: None for asset in ASSETS}
+        self.previous_emas = {asset: {'ema_240': None, 'ema_600': None} for asset in ASSETS}
+        self.recent_cross_events = {asset: [] for asset in ASSETS}
+        self.daily_cross_count = {asset: 0 for asset in ASSETS}
         # Configure based on your backtesting - this is a demo value
         # Adjust based on market conditions and risk tolerance
         self.cross_threshold = 12  # Example: Daily EMA cross limit per asset
 
         # Market alert tracking
-        self.previous_regimes = {
-            'BTC': None,
-            'ETH': None,
-            'SOL': None
-        }
-        self.price_history = {
-            'BTC': [],
-            'ETH': [],
-            'SOL': []
-        }
-        self.volume_history = {
-            'BTC': [],
-            'ETH': [],
-            'SOL': []
-        }
-        self.recent_alerts = {
-            'BTC': [],
-            'ETH': [],
-            'SOL': []
-        }
+        self.previous_regimes = {asset: None for asset in ASSETS}
+        self.price_history = {asset: [] for asset in ASSETS}
+        self.volume_history = {asset: [] for asset in ASSETS}
+        self.recent_alerts = {asset: [] for asset in ASSETS}
         # Cooldown prevents notification spam - adjust as needed
         self.alert_cooldown_minutes = 15  # Example: Minimum time between similar alerts
 
         # Trade execution cooldown tracking
-        self.asset_cooldowns = {
-            'BTC': None,  # Will store {'end_time': datetime, 'reason': str, 'started_at': datetime}
-            'ETH': None,
-            'SOL': None
-        }
+        # Each entry stores {'end_time': datetime, 'reason': str, 'started_at': datetime} when active
+        self.asset_cooldowns = {asset: None for asset in ASSETS}
         # Prevents overtrading - configure based on your strategy
         self.cooldown_duration_hours = 1  # Example: 1-hour cooldown after trade execution
         
     def update_position(self, asset: str, in_position: bool, entry_price: float = 0, 
                        asset_amount: float = 0, leveraged_value: float = 0):
         """Update position tracking for an asset"""
-        if asset in self.asset_positions:
-            self.asset_positions[asset].update({
-                'in_position': in_position,
-                'entry_price': entry_price,
-                'asset_amount': asset_amount,
-                'leveraged_value': leveraged_value,
-                'entry_time': datetime.now(timezone.utc) if in_position else None
-            })
-            logger.info(f"📊 {asset}: Position updated - In Position: {in_position}")
+        position = self.asset_positions.get(asset)
+        if position is None:
+            logger.warning(f"⚠️ {asset}: Position update ignored - asset not tracked by strategy engine")
+            return
+        position.update({
+            'in_position': in_position,
+            'entry_price': entry_price,
+            'asset_amount': asset_amount,
+            'leveraged_value': leveraged_value,
+            'entry_time': datetime.now(timezone.utc) if in_position else None,
+            'entry_time_epoch': time.time() if in_position else 0.0
+        })
+        logger.info(f"📊 {asset}: Position updated - In Position: {in_position}")
     
     def determine_market_regime(self, market_data: MarketData) -> MarketRegime:
         """Determine if market is in active or inactive regime based on EMA positioning"""
-        # Market is ACTIVE when price is below BOTH EMAs (favorable for shorting)
-        # Market is INACTIVE when price is above one or both EMAs
-        
-        price = market_data.price
-        ema_240 = market_data.ema_240
-        ema_600 = market_data.ema_600
-        
-        # Check for ACTIVE regime: price below both EMAs
-        if price < ema_240 and price < ema_600:
-            regime = MarketRegime.ACTIVE
-        else:
-            regime = MarketRegime.INACTIVE
+        regime = self._classify_regime(market_data.price, market_data.ema_240, market_data.ema_600)
         
         # Update regime tracking
         self.current_regimes[market_data.asset] = regime
         
         return regime
     
+    @staticmethod
+    def _classify_regime(price: float, ema_240: float, ema_600: float) -> MarketRegime:
+        # Market is ACTIVE when price is below BOTH EMAs (favorable for shorting)
+        # Market is INACTIVE when price is above one or both EMAs
+        if price < ema_240 and price < ema_600:
+            return MarketRegime.ACTIVE
+        return MarketRegime.INACTIVE
+    
     def check_regime_change(self, market_data: MarketData) -> Dict[str, Any]:
         """Check if there's a regime change for the asset and return details"""
         asset = market_data.asset
@@ -166,6 +139,13 @@ class MultiAssetStrategyEngine:
         # Update the previous regime for next check
         self.previous_regimes[asset] = current_regime
         
+        return self._regime_change_info(asset, market_data.price, market_data.ema_240,
+                                        market_data.ema_600, previous_regime, current_regime)
+    
+    @staticmethod
+    def _regime_change_info(asset: str, price: float, ema_240: float, ema_600: float,
+                            previous_regime: Optional[MarketRegime],
+                            current_regime: MarketRegime) -> Dict[str, Any]:
         # Return regime change info if there was a change
         if previous_regime is not None and previous_regime != current_regime:
             return {
@@ -173,9 +153,9 @@ class MultiAssetStrategyEngine:
                 'previous_regime': previous_regime.value,
                 'current_regime': current_regime.value,
                 'asset': asset,
-                'price': market_data.price,
-                'ema_240': market_data.ema_240,
-                'ema_600': market_data.ema_600
+                'price': price,
+                'ema_240': ema_240,
+                'ema_600': ema_600
             }
         
         return {'changed': False}
@@ -236,7 +216,7 @@ class MultiAssetStrategyEngine:
         """Get cooldown status for all assets"""
         return {
             asset: self.get_cooldown_status(asset) 
-            for asset in ['BTC', 'ETH', 'SOL']
+            for asset in ASSETS
         }
     
     def get_trade_duration(self, asset: str) -> dict:
@@ -270,22 +250,24 @@ class MultiAssetStrategyEngine:
     
     def detect_price_ema_crosses(self, market_data: MarketData) -> list:
         """Detect price crossing below EMAs (price-EMA crosses)"""
-        asset = market_data.asset
-        current_price = market_data.price
-        current_ema_240 = market_data.ema_240
-        current_ema_600 = market_data.ema_600
-        
+        return self._detect_crosses(market_data.asset, market_data.price, market_data.ema_240,
+                                    market_data.ema_600, market_data.timestamp)
+    
+    def _detect_crosses(self, asset: str, current_price: float, current_ema_240: float,
+                        current_ema_600: float, timestamp: datetime) -> list:
         cross_events = []
         
-        # Get previous data
-        previous_price = self.previous_prices.get(asset)
-        previous_ema_240 = self.previous_emas[asset]['ema_240']
-        previous_ema_600 = self.previous_emas[asset]['ema_600']
+        # Get previous data (bind the per-asset containers once)
+        previous_emas = self.previous_emas[asset]
+        recent_cross_events = self.recent_cross_events[asset]
+        previous_price = self.previous_prices[asset]
+        previous_ema_240 = previous_emas['ema_240']
+        previous_ema_600 = previous_emas['ema_600']
         
         # Store current data for next iteration
         self.previous_prices[asset] = current_price
-        self.previous_emas[asset]['ema_240'] = current_ema_240
-        self.previous_emas[asset]['ema_600'] = current_ema_600
+        previous_emas['ema_240'] = current_ema_240
+        previous_emas['ema_600'] = current_ema_600
         
         # Skip first iteration (no previous data)
         if previous_price is None or previous_ema_240 is None or previous_ema_600 is None:
@@ -299,12 +281,12 @@ class MultiAssetStrategyEngine:
             cross_event = {
                 'asset': asset,
                 'type': 'PRICE_BELOW_EMA240',
-                'timestamp': market_data.timestamp,
+                'timestamp': timestamp,
                 'price': current_price,
                 'ema': current_ema_240
             }
             cross_events.append(cross_event)
-            self.recent_cross_events[asset].append(cross_event)
+            recent_cross_events.append(cross_event)
             self.daily_cross_count[asset] += 1
             logger.info(f"🔽 {asset}: Price crossed below EMA240 - Price: ${current_price:.2f}, EMA240: ${current_ema_240:.2f}")
         
@@ -316,12 +298,12 @@ class MultiAssetStrategyEngine:
             cross_event = {
                 'asset': asset,
                 'type': 'PRICE_BELOW_EMA600',
-                'timestamp': market_data.timestamp,
+                'timestamp': timestamp,
                 'price': current_price,
                 'ema': current_ema_600
             }
             cross_events.append(cross_event)
-            self.recent_cross_events[asset].append(cross_event)
+            recent_cross_events.append(cross_event)
             self.daily_cross_count[asset] += 1
             logger.info(f"🔽 {asset}: Price crossed below EMA600 - Price: ${current_price:.2f}, EMA600: ${current_ema_600:.2f}")
         
@@ -329,17 +311,21 @@ class MultiAssetStrategyEngine:
     
     def update_market_data_history(self, market_data: MarketData):
         """Update price and volume history for market analysis"""
-        asset = market_data.asset
+        self._update_history(market_data.asset, market_data.price, market_data.volume)
+    
+    def _update_history(self, asset: str, price: float, volume: float):
+        price_history = self.price_history[asset]
+        volume_history = self.volume_history[asset]
         
         # Update price history (keep last 20 data points)
-        self.price_history[asset].append(market_data.price)
-        if len(self.price_history[asset]) > 20:
-            self.price_history[asset].pop(0)
+        price_history.append(price)
+        if len(price_history) > 20:
+            price_history.pop(0)
         
         # Update volume history (keep last 20 data points)
-        self.volume_history[asset].append(market_data.volume)
-        if len(self.volume_history[asset]) > 20:
-            self.volume_history[asset].pop(0)
+        volume_history.append(volume)
+        if len(volume_history) > 20:
+            volume_history.pop(0)
     
     def is_alert_on_cooldown(self, asset: str, alert_type: AlertType) -> bool:
         """Check if similar alert is still on cooldown"""
@@ -363,16 +349,26 @@ class MultiAssetStrategyEngine:
     
     def detect_market_alerts(self, market_data: MarketData) -> List[MarketAlert]:
         """Detect various market alert conditions"""
-        alerts = []
         asset = market_data.asset
         
         # Update historical data
         self.update_market_data_history(market_data)
         
-        # 1. Regime Change Alert
         current_regime = self.determine_market_regime(market_data)
         previous_regime = self.previous_regimes.get(asset)
         
+        # Update previous regime
+        self.previous_regimes[asset] = current_regime
+        
+        return self._detect_alerts(asset, market_data.price, market_data.ema_240, market_data.ema_600,
+                                   previous_regime, current_regime)
+    
+    def _detect_alerts(self, asset: str, price: float, ema_240: float, ema_600: float,
+                       previous_regime: Optional[MarketRegime],
+                       current_regime: MarketRegime) -> List[MarketAlert]:
+        alerts = []
+        
+        # 1. Regime Change Alert
         if (previous_regime is not None and 
             previous_regime != current_regime and
             not self.is_alert_on_cooldown(asset, AlertType.REGIME_CHANGE)):
@@ -388,31 +384,33 @@ class MultiAssetStrategyEngine:
             alert = MarketAlert(
                 asset=asset,
                 alert_type=AlertType.REGIME_CHANGE,
-                price=market_data.price,
+                price=price,
                 description=description,
                 severity=severity,
                 timestamp=datetime.now(timezone.utc),
                 metadata={
                     'previous_regime': previous_regime.value,
                     'current_regime': current_regime.value,
-                    'ema_240': market_data.ema_240,
-                    'ema_600': market_data.ema_600
+                    'ema_240': ema_240,
+                    'ema_600': ema_600
                 }
             )
             alerts.append(alert)
             self.add_alert(alert)
         
-        # Update previous regime
-        self.previous_regimes[asset] = current_regime
-        
         # 2. Significant Price Movement Alert
-        if len(self.price_history[asset]) >= 3:
-            recent_prices = self.price_history[asset][-3:]
-            price_change_pct = ((recent_prices[-1] - recent_prices[0]) / recent_prices[0]) * 100
+        price_history = self.price_history[asset]
+        if len(price_history) >= 3:
+            recent_prices = price_history[-3:]
+            start_price = recent_prices[0]
+            price_delta = recent_prices[-1] - start_price
+            move_threshold = start_price * 0.02  # 2% movement in 3 bars (15 minutes)
             
-            if (abs(price_change_pct) > 2.0 and  # 2% movement in 3 bars (15 minutes)
+            if ((price_delta > move_threshold or price_delta < -move_threshold) and
                 not self.is_alert_on_cooldown(asset, AlertType.PRICE_MOVEMENT)):
                 
+                # Exact percentage only needed once the alert fires
+                price_change_pct = (price_delta / start_price) * 100
                 direction = "dropped" if price_change_pct < 0 else "surged"
                 severity = "HIGH" if abs(price_change_pct) > 4.0 else "MEDIUM"
                 
@@ -423,7 +421,7 @@ class MultiAssetStrategyEngine:
                 alert = MarketAlert(
                     asset=asset,
                     alert_type=AlertType.PRICE_MOVEMENT,
-                    price=market_data.price,
+                    price=price,
                     description=description,
                     severity=severity,
                     timestamp=datetime.now(timezone.utc),
@@ -438,8 +436,9 @@ class MultiAssetStrategyEngine:
                 self.add_alert(alert)
         
         # 3. Volume Spike Alert
-        if len(self.volume_history[asset]) >= 5:
-            recent_volumes = self.volume_history[asset][-5:]
+        volume_history = self.volume_history[asset]
+        if len(volume_history) >= 5:
+            recent_volumes = volume_history[-5:]
             current_volume = recent_volumes[-1]
             avg_volume = sum(recent_volumes[:-1]) / len(recent_volumes[:-1])
             
@@ -456,7 +455,7 @@ class MultiAssetStrategyEngine:
                 alert = MarketAlert(
                     asset=asset,
                     alert_type=AlertType.VOLUME_SPIKE,
-                    price=market_data.price,
+                    price=price,
                     description=description,
                     severity=severity,
                     timestamp=datetime.now(timezone.utc),
@@ -470,25 +469,27 @@ class MultiAssetStrategyEngine:
                 self.add_alert(alert)
         
         # 4. EMA Convergence Alert
-        ema_diff_pct = abs(market_data.ema_240 - market_data.ema_600) / market_data.ema_600 * 100
+        ema_diff = ema_240 - ema_600
+        convergence_threshold = ema_600 * 0.005  # EMAs within 0.5% of each other
         
-        if (ema_diff_pct < 0.5 and  # EMAs within 0.5% of each other
+        if (-convergence_threshold < ema_diff < convergence_threshold and
             not self.is_alert_on_cooldown(asset, AlertType.EMA_CONVERGENCE)):
             
+            ema_diff_pct = abs(ema_diff) / ema_600 * 100
             description = (f"EMA convergence detected: EMA240 and EMA600 within {ema_diff_pct:.2f}%. "
-                          f"EMA240: ${market_data.ema_240:.2f}, EMA600: ${market_data.ema_600:.2f}. "
+                          f"EMA240: ${ema_240:.2f}, EMA600: ${ema_600:.2f}. "
                           f"Potential breakout setup forming.")
             
             alert = MarketAlert(
                 asset=asset,
                 alert_type=AlertType.EMA_CONVERGENCE,
-                price=market_data.price,
+                price=price,
                 description=description,
                 severity="MEDIUM",
                 timestamp=datetime.now(timezone.utc),
                 metadata={
-                    'ema_240': market_data.ema_240,
-                    'ema_600': market_data.ema_600,
+                    'ema_240': ema_240,
+                    'ema_600': ema_600,
                     'ema_diff_pct': ema_diff_pct
                 }
             )
@@ -508,14 +509,25 @@ class MultiAssetStrategyEngine:
     
     def generate_asset_signal(self, market_data: MarketData) -> TradingSignal:
         """Generate trading signal for a single asset"""
-        asset = market_data.asset
-        
         # Determine market regime
         regime = self.determine_market_regime(market_data)
         
         # Detect price-EMA crosses
         cross_events = self.detect_price_ema_crosses(market_data)
         
+        return self._build_signal(market_data.asset, market_data.price, market_data.ema_240,
+                                  market_data.ema_600, regime, cross_events)
+    
+    def _build_signal(self, asset: str, price: float, ema_240: float, ema_600: float,
+                      regime: MarketRegime, cross_events: list) -> TradingSignal:
+        # Only one signal is returned, so the metadata dict can be shared by every branch
+        metadata = {
+            'ema_240': ema_240,
+            'ema_600': ema_600,
+            'regime': regime.value,
+            'cross_events': cross_events
+        }
+        
         # Check if already in position
         in_position = self.asset_positions[asset]['in_position']
         
@@ -525,31 +537,21 @@ class MultiAssetStrategyEngine:
             return TradingSignal(
                 asset=asset,
                 signal_type=SignalType.NO_ACTION,
-                price=market_data.price,
+                price=price,
                 reason="In position - exit conditions checked separately",
-                metadata={
-                    'ema_240': market_data.ema_240,
-                    'ema_600': market_data.ema_600,
-                    'regime': regime.value,
-                    'cross_events': cross_events
-                }
+                metadata=metadata
             )
         
         # Check asset cooldown (prevents trading during cooldown period)
         if self.is_asset_in_cooldown(asset):
             cooldown_status = self.get_cooldown_status(asset)
+            metadata['cooldown_status'] = cooldown_status
             return TradingSignal(
                 asset=asset,
                 signal_type=SignalType.NO_ACTION,
-                price=market_data.price,
+                price=price,
                 reason=f"Asset in cooldown - {cooldown_status['reason']} ({cooldown_status['remaining_formatted']} remaining)",
-                metadata={
-                    'ema_240': market_data.ema_240,
-                    'ema_600': market_data.ema_600,
-                    'regime': regime.value,
-                    'cross_events': cross_events,
-                    'cooldown_status': cooldown_status
-                }
+                metadata=metadata
             )
         
         # Check market regime first (primary condition)
@@ -557,14 +559,9 @@ class MultiAssetStrategyEngine:
             return TradingSignal(
                 asset=asset,
                 signal_type=SignalType.NO_ACTION,
-                price=market_data.price,
+                price=price,
                 reason=f"Market regime not active - Regime: {regime.value}",
-                metadata={
-                    'ema_240': market_data.ema_240,
-                    'ema_600': market_data.ema_600,
-                    'regime': regime.value,
-                    'cross_events': cross_events
-                }
+                metadata=metadata
             )
         
         # Check daily cross limit
@@ -572,14 +569,9 @@ class MultiAssetStrategyEngine:
             return TradingSignal(
                 asset=asset,
                 signal_type=SignalType.NO_ACTION,
-                price=market_data.price,
+                price=price,
                 reason=f"Daily cross limit exceeded ({self.daily_cross_count[asset]}/{self.cross_threshold})",
-                metadata={
-                    'ema_240': market_data.ema_240,
-                    'ema_600': market_data.ema_600,
-                    'regime': regime.value,
-                    'cross_events': cross_events
-                }
+                metadata=metadata
             )
         
         # Check for recent price-EMA cross (entry trigger)
@@ -587,14 +579,9 @@ class MultiAssetStrategyEngine:
             return TradingSignal(
                 asset=asset,
                 signal_type=SignalType.NO_ACTION,
-                price=market_data.price,
+                price=price,
                 reason="No recent price-EMA cross detected",
-                metadata={
-                    'ema_240': market_data.ema_240,
-                    'ema_600': market_data.ema_600,
-                    'regime': regime.value,
-                    'cross_events': cross_events
-                }
+                metadata=metadata
             )
         
         # All conditions met - generate entry signal
@@ -602,20 +589,54 @@ class MultiAssetStrategyEngine:
         return TradingSignal(
             asset=asset,
             signal_type=SignalType.ENTER_SHORT,
-            price=market_data.price,
+            price=price,
             reason=f"Price-EMA cross in ACTIVE regime - Crosses: {cross_types}",
-            metadata={
-                'ema_240': market_data.ema_240,
-                'ema_600': market_data.ema_600,
-                'regime': regime.value,
-                'cross_events': cross_events
-            }
+            metadata=metadata
         )
     
-    def should_exit_position(self, asset: str, current_price: float, current_time: datetime, 
+    def process_tick(self, market_data: MarketData, with_alerts: bool = True) -> TickResult:
+        """Run regime, cross, signal and alert detection for one bar in a single pass
+        
+        Reads the MarketData fields and updates the per-asset regime state once,
+        instead of once per generate_asset_signal / check_regime_change /
+        detect_market_alerts call.
+        
+        Args:
+            market_data: Latest bar for the asset
+            with_alerts: Also update price/volume history and evaluate market alerts
+        
+        Returns:
+            TickResult with the signal, regime change info, cross events and alerts
+        """
+        asset = market_data.asset
+        price = market_data.price
+        ema_240 = market_data.ema_240
+        ema_600 = market_data.ema_600
+        
+        regime = self._classify_regime(price, ema_240, ema_600)
+        self.current_regimes[asset] = regime
+        previous_regime = self.previous_regimes.get(asset)
+        self.previous_regimes[asset] = regime
+        
+        cross_events = self._detect_crosses(asset, price, ema_240, ema_600, market_data.timestamp)
+        signal = self._build_signal(asset, price, ema_240, ema_600, regime, cross_events)
+        regime_change = self._regime_change_info(asset, price, ema_240, ema_600, previous_regime, regime)
+        
+        alerts = []
+        if with_alerts:
+            self._update_history(asset, price, market_data.volume)
+            alerts = self._detect_alerts(asset, price, ema_240, ema_600, previous_regime, regime)
+        
+        return TickResult(signal=signal, regime_change=regime_change,
+                          cross_events=cross_events, alerts=alerts)
+    
+    def should_exit_position(self, asset: str, current_price: float, current_time: float, 
                            current_regime: MarketRegime = None) -> tuple[bool, str]:
         """Check if position should be exited based on strategy rules with asset-specific risk parameters
         
+        Args:
+            current_time: Current time as epoch seconds (time.time())
+        
         Returns:
             tuple: (should_exit: bool, exit_reason: str)
         """
@@ -627,7 +648,7 @@ class MultiAssetStrategyEngine:
         
         position = self.asset_positions[asset]
         entry_price = position['entry_price']
-        entry_time = position['entry_time']
+        entry_time_epoch = position['entry_time_epoch']
         
         # Get asset-specific risk parameters
         risk_params = settings.get_asset_risk_params(asset)
@@ -662,7 +683,7 @@ class MultiAssetStrategyEngine:
             return True, "Stop Loss"
         
         # 3. Time-based exit (24 hours max hold)
-        if entry_time and (current_time - entry_time) > timedelta(hours=24):
+        if entry_time_epoch and (current_time - entry_time_epoch) > 86400.0:
             logger.info(f"🕐 {asset}: Time-based exit after 24 hours")
             return True, "Time Limit (24h)"
         
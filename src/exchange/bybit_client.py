@@ -1,100 +1,402 @@
 import asyncio
 import aiohttp
-import json
+import orjson
 import time
 import hmac
-import hashlib
 import logging
-from typing import Dict, List, Optional, Any
+import random
+import numpy as np
+from collections import defaultdict
+from functools import lru_cache, wraps
+from typing import Dict, List, Optional, Any, Union, AsyncIterator
 from urllib.parse import urlencode
+from yarl import URL
 from decimal import Decimal, ROUND_DOWN
 
 from config.settings import settings
+from src.exchange.bybit_ws import BybitWS
 
 logger = logging.getLogger(__name__)
 
+# retCodes that signal a temporary condition (server busy/timeout, clock skew, rate limit);
+# only GETs are retried on them since a POST may already have been executed
+TRANSIENT_RET_CODES = frozenset({10000, 10002, 10006, 10016})
+
+class BybitAPIError(Exception):
+    """Request to the Bybit API failed"""
+
+class BybitTransientError(BybitAPIError):
+    """Failure that is safe to retry (rate limiting, 5xx, timeouts, connection errors)"""
+
+class BybitFatalError(BybitAPIError):
+    """Request was rejected and retrying it will not help"""
+
+def retry_transient(max_attempts: int = 4, base_delay: float = 0.2):
+    """Retry an async call on BybitTransientError with exponential backoff and jitter"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(max_attempts):
+                try:
+                    return await func(*args, **kwargs)
+                except BybitTransientError as e:
+                    if attempt == max_attempts - 1:
+                        logger.error(f"Request failed after {max_attempts} attempts: {e}")
+                        raise
+                    delay = base_delay * 2 ** attempt + random.random() * 0.05
+                    logger.warning(f"{e} - retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+        return wrapper
+    return decorator
+
+# Sign applied to a position's size when netting positions for a symbol
+POSITION_SIDE_SIGN = {'Buy': 1.0, 'Sell': -1.0}
+
+@lru_cache(maxsize=256)
+def _encode_query(items: tuple) -> bytes:
+    """Sorted query string, sent and signed as-is; cached since the same GET params repeat every poll"""
+    return urlencode(items).encode('ascii')
+
+@lru_cache(maxsize=64)
+def _step_decimals(step: float) -> int:
+    """Number of decimal places implied by a qty step / price tick (e.g. 0.001 -> 3)"""
+    exponent = Decimal(str(step)).normalize().as_tuple().exponent
+    return max(0, -exponent)
+
+@lru_cache(maxsize=64)
+def _step_scale(step: float) -> tuple:
+    """(10**decimals, step in those units) so a step can be applied with integer math"""
+    scale = 10 ** _step_decimals(step)
+    return scale, round(step * scale)
+
+def _format_step(value: float, step: float) -> str:
+    """Format value for the API with the precision of step, falling back to str() without one"""
+    if step > 0:
+        return f"{value:.{_step_decimals(step)}f}"
+    return str(value)
+
+class TokenBucket:
+    """Async token bucket used to pace requests against Bybit rate limits"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate  # tokens added per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+    
+    async def acquire(self, n: float = 1):
+        """Wait until n tokens are available and consume them"""
+        # Fast path: nothing queued and tokens on hand - consume without awaiting.
+        # Safe without the lock since there is no await between check and decrement.
+        if not self._lock.locked():
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self.blocked_until and self.tokens >= n:
+                self.tokens -= n
+                return
+        
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= n:
+                    self.tokens -= n
+                    return
+                else:
+                    wait = (n - self.tokens) / self.rate
+                # Up to 10% jitter so waiters released by the same refill/reset don't fire in lockstep
+                await asyncio.sleep(wait * (1 + 0.1 * random.random()))
+    
+    def update_from_headers(self, headers):
+        """Sync the bucket with Bybit's X-Bapi-Limit-* response headers"""
+        remaining = headers.get('X-Bapi-Limit-Status')
+        if remaining is None:
+            return
+        try:
+            remaining = float(remaining)
+            limit = headers.get('X-Bapi-Limit')
+            if limit:
+                self.capacity = max(1.0, float(limit))
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, remaining)
+            
+            # Exchange says the window is exhausted - hold off until it resets
+            reset_ms = headers.get('X-Bapi-Limit-Reset-Timestamp')
+            if remaining <= 0 and reset_ms:
+                wait = int(reset_ms) / 1000 - time.time()
+                if wait > 0:
+                    self.blocked_until = time.monotonic() + wait
+        except (TypeError, ValueError):
+            pass
+
 class BybitClient:
-    def __init__(self):
+    def __init__(self, ws: Optional[BybitWS] = None):
         self.api_key = settings.exchange.api_key
         self.api_secret = settings.exchange.api_secret
         self.base_url = settings.exchange.base_url
         self.testnet = settings.exchange.testnet
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.request_interval = 0.1  # 100ms between requests
-        
-        # Instrument specifications cache
-        self.instrument_specs = {}
+        # Optional WebSocket snapshots that serve tickers/klines without a REST call
+        self.ws = ws
         
-    def _generate_signature(self, timestamp: str, params: str) -> str:
-        """Generate HMAC SHA256 signature for Bybit V5 API"""
-        recv_window = "5000"
-        param_str = f"{timestamp}{self.api_key}{recv_window}{params}"
-        return hmac.new(
-            self.api_secret.encode('utf-8'),
-            param_str.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-    
-    def _get_headers(self, params: str = "") -> Dict[str, str]:
-        """Generate headers for Bybit API requests"""
-        timestamp = str(int(time.time() * 1000))
-        signature = self._generate_signature(timestamp, params)
+        # Keyed HMAC state; copied per request so the secret's ipad/opad are hashed once
+        self._hmac_template = hmac.new(self.api_secret.encode('utf-8'), digestmod='sha256')
+        # Constant api_key + recv_window part of the signed payload, encoded once
+        self._sig_infix = f"{self.api_key}5000".encode('utf-8')
         
-        return {
+        # Header values that never change between requests
+        self._base_headers = {
             'X-BAPI-API-KEY': self.api_key,
-            'X-BAPI-SIGN': signature,
             'X-BAPI-SIGN-TYPE': '2',
-            'X-BAPI-TIMESTAMP': timestamp,
             'X-BAPI-RECV-WINDOW': '5000',
             'Content-Type': 'application/json'
         }
+        # (endpoint, query) -> (signed at ms, headers) for repeated GET polls
+        self._signed_get_cache: Dict[tuple, tuple] = {}
+        
+        # Rate limiting
+        self.request_interval = 0.1  # 100ms average spacing between requests
+        # Bybit allows 10 concurrent connections per IP; callers beyond that queue on the semaphore
+        self.max_concurrent_requests = 10
+        self._request_semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        # Bybit limits each endpoint group separately, so unrelated groups don't wait on each other
+        self._buckets = {
+            'market': TokenBucket(rate=50, capacity=50),
+            'order': TokenBucket(rate=10, capacity=10),
+            'position': TokenBucket(rate=10, capacity=10),
+            'account': TokenBucket(rate=10, capacity=10),
+            'execution': TokenBucket(rate=10, capacity=10)
+        }
+        self._default_bucket = TokenBucket(rate=1 / self.request_interval, capacity=10)
+        
+        # Instrument specifications cache
+        self.instrument_specs = {}
+        self._validators: Dict[str, tuple] = {}  # symbol -> (specs dict, validator)
+        
+        # Short-lived cache for idempotent GET endpoints: key -> (expires_at, result)
+        self.cache_ttls = {
+            '/v5/market/tickers': 0.5,
+            '/v5/position/list': 1.0,
+            '/v5/order/history': 1.0,
+            '/v5/execution/list': 1.0,
+            '/v5/market/instruments-info': 3600.0  # lot size / tick rules change rarely
+        }
+        self._cache: Dict[tuple, tuple] = {}
+        self._cache_locks: Dict[tuple, asyncio.Lock] = defaultdict(asyncio.Lock)
+        
+        # Shared HTTP session (created lazily inside the running event loop)
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=32,
+                limit_per_host=self.max_concurrent_requests,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def _generate_signature(self, timestamp: str, params: Union[str, bytes]) -> str:
+        """Generate HMAC SHA256 signature for Bybit V5 API
+        
+        Signs timestamp + api_key + recv_window + params; params may be the
+        query string or the already-encoded JSON body.
+        """
+        h = self._hmac_template.copy()
+        h.update(timestamp.encode('ascii'))
+        h.update(self._sig_infix)
+        h.update(params if isinstance(params, bytes) else params.encode('utf-8'))
+        return h.hexdigest()
+    
+    def _get_headers(self, params: Union[str, bytes] = "") -> Dict[str, str]:
+        """Generate headers for Bybit API requests"""
+        timestamp = str(time.time_ns() // 1_000_000)
+        
+        headers = self._base_headers.copy()
+        headers['X-BAPI-SIGN'] = self._generate_signature(timestamp, params)
+        headers['X-BAPI-TIMESTAMP'] = timestamp
+        return headers
+    
+    def _get_signed_get_headers(self, endpoint: str, payload: bytes) -> Dict[str, str]:
+        """Signed headers for a GET, reused while well inside the recv window
+        
+        Polling repeats the same query every few hundred ms; a signature stays valid
+        for the whole 5s recv window, so it's only regenerated every 2s.
+        """
+        key = (endpoint, payload)
+        now_ms = time.time_ns() // 1_000_000
+        cached = self._signed_get_cache.get(key)
+        if cached is not None and now_ms - cached[0] < 2000:
+            return cached[1]
+        
+        if len(self._signed_get_cache) >= 256:
+            self._signed_get_cache.clear()
+        headers = self._get_headers(payload)
+        self._signed_get_cache[key] = (int(headers['X-BAPI-TIMESTAMP']), headers)
+        return headers
     
+    @retry_transient(max_attempts=4, base_delay=0.2)
     async def _make_request(self, method: str, endpoint: str, params: Dict = None) -> Dict:
-        """Make HTTP request to Bybit V5 API with rate limiting"""
-        # Rate limiting
-        current_time = time.time()
-        if current_time - self.last_request_time < self.request_interval:
-            await asyncio.sleep(self.request_interval - (current_time - self.last_request_time))
+        """Make HTTP request to Bybit V5 API with rate limiting
         
+        Raises:
+            BybitTransientError: Retryable failure, raised once retries are exhausted
+            BybitFatalError: Request rejected by the exchange
+            BybitAPIError: POST failed in a way that may still have reached the exchange
+        """
+        try:
+            return await self._send_request(method, endpoint, params)
+        except BybitTransientError:
+            # Retries must be signed afresh; a reused GET signature may be what was
+            # rejected (retCode 10002 when the timestamp falls outside the recv window)
+            self._signed_get_cache.clear()
+            raise
+    
+    async def _send_request(self, method: str, endpoint: str, params: Dict = None) -> Dict:
+        """Send one request to the Bybit V5 API (see _make_request)"""
         url = f"{self.base_url}{endpoint}"
         params = params or {}
+        method = method.upper()
+        
+        # GET signs the sorted query string, POST signs the JSON body; the same
+        # bytes go on the wire so the signed payload always matches what is sent
+        if method == 'GET':
+            body = None
+            payload = _encode_query(tuple(sorted(params.items()))) if params else b""
+            if payload:
+                url = URL(f"{url}?{payload.decode('ascii')}", encoded=True)
+        elif method == 'POST':
+            body = payload = orjson.dumps(params, option=orjson.OPT_SORT_KEYS) if params else b""
+        else:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
+        # /v5/<group>/... -> bucket for that endpoint group
+        parts = endpoint.split('/')
+        bucket = self._buckets.get(parts[2] if len(parts) > 2 else '', self._default_bucket)
+        
+        # A POST that may have reached the exchange must not be replayed (it could place an order twice)
+        idempotent = method == 'GET'
         
         try:
-            async with aiohttp.ClientSession() as session:
-                if method.upper() == 'GET':
-                    param_str = urlencode(sorted(params.items())) if params else ""
-                    headers = self._get_headers(param_str)
-                    async with session.get(url, params=params, headers=headers) as response:
-                        if response.status != 200:
-                            text = await response.text()
-                            raise Exception(f"HTTP {response.status}: {text}")
-                        data = await response.json()
-                        
-                elif method.upper() == 'POST':
-                    param_str = json.dumps(params, separators=(',', ':'), sort_keys=True) if params else ""
-                    headers = self._get_headers(param_str)
-                    async with session.post(url, data=param_str, headers=headers) as response:
-                        if response.status != 200:
-                            text = await response.text()
-                            raise Exception(f"HTTP {response.status}: {text}")
-                        data = await response.json()
-                
-                self.last_request_time = time.time()
-                
-                if data.get('retCode') != 0:
-                    logger.error(f"Bybit API error: {data}")
-                    raise Exception(f"Bybit API error: {data.get('retMsg', 'Unknown error')}")
-                
-                return data.get('result', {})
-                
-        except aiohttp.ClientError as e:
-            logger.error(f"HTTP client error: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Request failed: {e}")
-            raise
+            session = await self._get_session()
+            # Pace with the endpoint group's token bucket before taking a concurrency slot, so
+            # requests throttled in one group don't hold slots that other groups need
+            await bucket.acquire()
+            # Cap in-flight requests; signing happens here so the timestamp is taken after any wait
+            async with self._request_semaphore:
+                if idempotent:
+                    headers = self._get_signed_get_headers(endpoint, payload)
+                else:
+                    headers = self._get_headers(payload)
+                async with session.request(method, url, data=body, headers=headers) as response:
+                    bucket.update_from_headers(response.headers)
+                    status = response.status
+                    raw = await response.read()
+        except aiohttp.ClientConnectorError as e:
+            # Connection was never established, so the request was not sent
+            raise BybitTransientError(f"Connection to Bybit failed: {e}") from e
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            message = f"HTTP client error on {endpoint}: {e!r}"
+            if idempotent:
+                raise BybitTransientError(message) from e
+            logger.error(message)
+            raise BybitAPIError(message) from e
+        
+        if status != 200:
+            message = f"HTTP {status} from {endpoint}: {raw[:512].decode('utf-8', errors='replace')}"
+            # 429 is rejected before processing; 5xx is only safe to replay for GET
+            if status == 429 or (status >= 500 and idempotent):
+                raise BybitTransientError(message)
+            logger.error(f"Request failed: {message}")
+            raise BybitFatalError(message)
+        
+        # Orders and position changes make cached positions/history stale
+        if method == 'POST':
+            self.clear_cache(keep_market=True)
+        
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError as e:
+            message = f"Malformed response from {endpoint}: {e}"
+            if idempotent:
+                raise BybitTransientError(message) from e
+            logger.error(message)
+            raise BybitAPIError(message) from e
+        
+        ret_code = data.get('retCode')
+        if ret_code != 0:
+            message = f"Bybit API error: {data.get('retMsg', 'Unknown error')} (retCode {ret_code})"
+            if ret_code in TRANSIENT_RET_CODES:
+                # Server timeout/error on a POST may still have executed it
+                if idempotent:
+                    raise BybitTransientError(message)
+                logger.error(f"Bybit API error: {data}")
+                raise BybitAPIError(message)
+            logger.error(f"Bybit API error: {data}")
+            raise BybitFatalError(message)
+        
+        return data.get('result', {})
+    
+    async def _cached_get(self, endpoint: str, params: Dict, ttl: float = None) -> Dict:
+        """GET through the TTL cache, coalescing concurrent identical requests into one call"""
+        if ttl is None:
+            ttl = self.cache_ttls.get(endpoint, 0)
+        if ttl <= 0:
+            return await self._make_request('GET', endpoint, params)
+        
+        key = (endpoint, tuple(sorted(params.items())))
+        entry = self._cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        
+        async with self._cache_locks[key]:
+            # Another caller may have refreshed the entry while we waited
+            entry = self._cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            
+            result = await self._make_request('GET', endpoint, params)
+            self._cache[key] = (time.monotonic() + ttl, result)
+            return result
+    
+    def clear_cache(self, keep_market: bool = False):
+        """Drop cached GET responses
+        
+        Args:
+            keep_market: Keep /v5/market/ entries, which account activity doesn't change
+        """
+        if not keep_market:
+            self._cache.clear()
+            return
+        for key in [key for key in self._cache if not key[0].startswith('/v5/market/')]:
+            del self._cache[key]
     
     async def get_account_balance(self) -> Dict:
         """Get account balance for demo/testnet"""
@@ -102,7 +404,7 @@ class BybitClient:
             # Bybit V5 requires UNIFIED account type for demo
             result = await self._make_request('GET', '/v5/account/wallet-balance', {'accountType': 'UNIFIED'})
             return result
-        except Exception as e:
+        except BybitAPIError as e:
             logger.error(f"Failed to get account balance: {e}")
             # Return demo balance structure for testing
             return {
@@ -112,21 +414,79 @@ class BybitClient:
                 }]
             }
     
+    @staticmethod
+    def get_coin_balance(balance_info: Dict, coin: str = 'USDT', account_type: str = None) -> Optional[Dict]:
+        """Coin entry (walletBalance, equity, ...) from a get_account_balance() result, or None
+        
+        Args:
+            account_type: Only look in accounts of this type (e.g. 'UNIFIED'); all accounts if None
+        """
+        if not balance_info:
+            return None
+        coins = {
+            entry.get('coin'): entry
+            for account in balance_info.get('list', [])
+            if account_type is None or account.get('accountType') == account_type
+            for entry in account.get('coin', [])
+        }
+        return coins.get(coin)
+    
     async def get_positions(self, symbol: str = None) -> List[Dict]:
         """Get positions for specific symbol or all positions"""
+        if self.ws is not None and symbol:
+            positions = self.ws.get_positions(symbol)
+            if positions is not None:
+                return positions
+        
         try:
-            params = {'category': 'linear'}
-            if symbol:
-                params['symbol'] = symbol
-            
-            result = await self._make_request('GET', '/v5/position/list', params)
-            return result.get('list', [])
-        except Exception as e:
+            return await self._fetch_positions(symbol)
+        except BybitAPIError as e:
             logger.error(f"Failed to get positions: {e}")
             return []
     
+    async def _fetch_positions(self, symbol: str = None, ttl: float = None) -> List[Dict]:
+        """Positions from the REST API, seeding the position stream for symbol
+        
+        Raises:
+            BybitAPIError: The positions could not be read
+        """
+        params = {'category': 'linear'}
+        if symbol:
+            params['symbol'] = symbol
+        
+        result = await self._cached_get('/v5/position/list', params, ttl)
+        positions = result.get('list', [])
+        if self.ws is not None and symbol:
+            self.ws.seed_positions(symbol, positions)
+        return positions
+    
+    async def get_all_positions(self, settle_coin: str = 'USDT') -> Dict[str, List[Dict]]:
+        """Get all positions settled in settle_coin with one call, grouped by symbol"""
+        try:
+            params = {'category': 'linear', 'settleCoin': settle_coin}
+            result = await self._cached_get('/v5/position/list', params)
+            
+            positions_by_symbol = defaultdict(list)
+            for position in result.get('list', []):
+                positions_by_symbol[position.get('symbol')].append(position)
+            
+            if self.ws is not None:
+                # The settleCoin listing is complete, so watched symbols missing from it are flat
+                for symbol in self.ws.symbols:
+                    if symbol.endswith(settle_coin):
+                        self.ws.seed_positions(symbol, positions_by_symbol.get(symbol, []))
+            return dict(positions_by_symbol)
+        except BybitAPIError as e:
+            logger.error(f"Failed to get positions: {e}")
+            return {}
+    
     async def get_klines(self, symbol: str, interval: str = '5', limit: int = 200) -> List[Dict]:
         """Get kline/candlestick data"""
+        if self.ws is not None:
+            rows = self.ws.get_klines(symbol, interval, limit)
+            if rows is not None:
+                return rows
+        
         try:
             params = {
                 'category': 'linear',
@@ -135,68 +495,143 @@ class BybitClient:
                 'limit': limit
             }
             
-            result = await self._make_request('GET', '/v5/market/kline', params)
-            return result.get('list', [])
-        except Exception as e:
+            # Cache for as many seconds as the bar interval is in minutes (e.g. 5s for 5m bars)
+            ttl = float(interval) if interval.isdigit() else 1.0
+            result = await self._cached_get('/v5/market/kline', params, ttl)
+            rows = result.get('list', [])
+            if self.ws is not None and rows:
+                self.ws.seed_klines(symbol, interval, rows)
+            return rows
+        except BybitAPIError as e:
             logger.error(f"Failed to get klines for {symbol}: {e}")
             return []
     
+    async def get_kline_arrays(self, symbol: str, interval: str = '5', limit: int = 200) -> Dict[str, np.ndarray]:
+        """Get kline data as column arrays in chronological order (oldest bar first)
+        
+        Returns:
+            Dict with 'ts' (int64 ms) and 'open', 'high', 'low', 'close', 'volume' (float64) arrays
+        """
+        klines = await self.get_klines(symbol, interval, limit)
+        if klines:
+            # Bybit rows are [startTime, open, high, low, close, volume, turnover], newest first
+            rows = np.array(klines, dtype=np.float64)[::-1]
+        else:
+            rows = np.empty((0, 7), dtype=np.float64)
+        
+        return {
+            'ts': rows[:, 0].astype(np.int64),
+            'open': np.ascontiguousarray(rows[:, 1]),
+            'high': np.ascontiguousarray(rows[:, 2]),
+            'low': np.ascontiguousarray(rows[:, 3]),
+            'close': np.ascontiguousarray(rows[:, 4]),
+            'volume': np.ascontiguousarray(rows[:, 5])
+        }
+    
     async def get_ticker(self, symbol: str) -> Dict:
         """Get ticker information for symbol"""
+        if self.ws is not None:
+            ticker = self.ws.get_ticker(symbol)
+            if ticker:
+                return ticker
+        
         try:
             params = {
                 'category': 'linear',
                 'symbol': symbol
             }
             
-            result = await self._make_request('GET', '/v5/market/tickers', params)
+            result = await self._cached_get('/v5/market/tickers', params)
             tickers = result.get('list', [])
             return tickers[0] if tickers else {}
-        except Exception as e:
+        except BybitAPIError as e:
             logger.error(f"Failed to get ticker for {symbol}: {e}")
             return {}
     
-    async def get_instrument_info(self, symbol: str) -> Dict:
-        """Get instrument specifications for symbol"""
+    @staticmethod
+    def _parse_instrument_spec(instrument: Dict) -> Dict:
+        """Instrument specification dict from an instruments-info row"""
+        lot_size = instrument.get('lotSizeFilter') or {}
+        price_filter = instrument.get('priceFilter') or {}
+        return {
+            'symbol': instrument.get('symbol'),
+            'min_order_qty': float(lot_size.get('minOrderQty', 0)),
+            'max_order_qty': float(lot_size.get('maxOrderQty', 0)),
+            'qty_step': float(lot_size.get('qtyStep', 0)),
+            'min_notional': float(lot_size.get('minNotionalValue', 0)),
+            'price_tick': float(price_filter.get('tickSize', 0)),
+            'status': instrument.get('status', 'Unknown')
+        }
+    
+    async def preload_instrument_specs(self, symbols: List[str] = None) -> int:
+        """Cache specifications for all linear instruments (or just symbols) in bulk
+        
+        Uses the paginated instruments-info listing instead of one request per symbol,
+        so the first order on a symbol doesn't pay for a spec lookup.
+        
+        Returns:
+            Number of symbols cached
+        """
+        wanted = set(symbols) if symbols else None
+        loaded = 0
+        try:
+            async for instrument in self._iter_pages('/v5/market/instruments-info',
+                                                     {'category': 'linear', 'limit': 1000}):
+                symbol = instrument.get('symbol')
+                if wanted is None or symbol in wanted:
+                    self.instrument_specs[symbol] = self._parse_instrument_spec(instrument)
+                    loaded += 1
+        except (BybitAPIError, ValueError, TypeError) as e:
+            logger.error(f"Failed to preload instrument specs: {e}")
+        
+        logger.info(f"📋 Cached instrument specs for {loaded} symbols")
+        if wanted:
+            missing = wanted.difference(self.instrument_specs)
+            if missing:
+                logger.warning(f"No instrument specs found for: {', '.join(sorted(missing))}")
+        return loaded
+    
+    async def initialize(self, symbols: List[str] = None):
+        """Open the HTTP session and preload instrument specs before trading starts"""
+        await self._get_session()
+        await self.preload_instrument_specs(symbols)
+    
+    async def get_instrument_info(self, symbol: str, refresh: bool = False) -> Dict:
+        """Get instrument specifications for symbol
+        
+        Args:
+            refresh: Bypass the response cache, e.g. after an order was rejected
+        """
         try:
             params = {
                 'category': 'linear',
                 'symbol': symbol
             }
             
-            result = await self._make_request('GET', '/v5/market/instruments-info', params)
+            result = await self._cached_get('/v5/market/instruments-info', params, ttl=0 if refresh else None)
             instruments = result.get('list', [])
             
             if instruments:
-                instrument = instruments[0]
                 # Cache the specifications
-                self.instrument_specs[symbol] = {
-                    'symbol': symbol,
-                    'min_order_qty': float(instrument.get('lotSizeFilter', {}).get('minOrderQty', 0)),
-                    'max_order_qty': float(instrument.get('lotSizeFilter', {}).get('maxOrderQty', 0)),
-                    'qty_step': float(instrument.get('lotSizeFilter', {}).get('qtyStep', 0)),
-                    'min_notional': float(instrument.get('lotSizeFilter', {}).get('minNotionalValue', 0)),
-                    'price_tick': float(instrument.get('priceFilter', {}).get('tickSize', 0)),
-                    'status': instrument.get('status', 'Unknown')
-                }
+                specs = self.instrument_specs[symbol] = self._parse_instrument_spec(instruments[0])
                 logger.info(f"📋 Cached instrument specs for {symbol}:")
-                logger.info(f"   Min Qty: {self.instrument_specs[symbol]['min_order_qty']}")
-                logger.info(f"   Max Qty: {self.instrument_specs[symbol]['max_order_qty']}")
-                logger.info(f"   Qty Step: {self.instrument_specs[symbol]['qty_step']}")
-                logger.info(f"   Min Notional: {self.instrument_specs[symbol]['min_notional']}")
-                return self.instrument_specs[symbol]
+                logger.info(f"   Min Qty: {specs['min_order_qty']}")
+                logger.info(f"   Max Qty: {specs['max_order_qty']}")
+                logger.info(f"   Qty Step: {specs['qty_step']}")
+                logger.info(f"   Min Notional: {specs['min_notional']}")
+                return specs
             else:
                 logger.error(f"No instrument info found for {symbol}")
                 return {}
                 
-        except Exception as e:
+        except (BybitAPIError, ValueError, TypeError) as e:
             logger.error(f"Failed to get instrument info for {symbol}: {e}")
             return {}
     
     def round_quantity(self, symbol: str, quantity: float) -> float:
         """Round quantity to meet instrument specifications"""
         if symbol not in self.instrument_specs:
-            logger.warning(f"No instrument specs cached for {symbol}, using raw quantity")
+            logger.warning("No instrument specs cached for %s, using raw quantity", symbol)
             return quantity
         
         specs = self.instrument_specs[symbol]
@@ -205,34 +640,38 @@ class BybitClient:
         max_qty = specs['max_order_qty']
         
         if qty_step <= 0:
-            logger.warning(f"Invalid qty_step for {symbol}: {qty_step}")
+            logger.warning("Invalid qty_step for %s: %s", symbol, qty_step)
             return quantity
         
-        # Use proper decimal rounding to nearest step (not floor)
-        decimal_qty = Decimal(str(quantity))
-        decimal_step = Decimal(str(qty_step))
-        
-        # Round to nearest step instead of rounding down
-        steps = (decimal_qty / decimal_step).quantize(Decimal('1'), rounding=ROUND_DOWN)
-        rounded_qty = float(steps * decimal_step)
+        # Round down to a whole number of steps in integer units of the step's precision.
+        # Float error can move a value sitting on a unit boundary across it (0.29 * 100 ==
+        # 28.999999999999996), so those are left to the exact Decimal computation below.
+        scale, step_units = _step_scale(qty_step)
+        scaled = quantity * scale
+        if 0 <= scaled < 1e15 and abs(scaled - round(scaled)) > 1e-9 * max(1.0, scaled):
+            units = int(scaled)
+            rounded_qty = (units - units % step_units) / scale
+        else:
+            steps = (Decimal(str(quantity)) / Decimal(str(qty_step))).quantize(Decimal('1'), rounding=ROUND_DOWN)
+            rounded_qty = float(steps * Decimal(str(qty_step)))
         
         # If rounded down to 0 or below minimum, use minimum
         if rounded_qty < min_qty:
             rounded_qty = min_qty
-            logger.info(f"Quantity {quantity} rounded up to minimum {min_qty} for {symbol}")
+            logger.info("Quantity %s rounded up to minimum %s for %s", quantity, min_qty, symbol)
         
         # Ensure maximum quantity
         if max_qty > 0 and rounded_qty > max_qty:
             rounded_qty = max_qty
-            logger.warning(f"Quantity {quantity} above maximum {max_qty} for {symbol}, using maximum")
+            logger.warning("Quantity %s above maximum %s for %s, using maximum", quantity, max_qty, symbol)
         
-        logger.debug(f"Rounded quantity for {symbol}: {quantity} -> {rounded_qty} (step: {qty_step})")
+        logger.debug("Rounded quantity for %s: %s -> %s (step: %s)", symbol, quantity, rounded_qty, qty_step)
         return rounded_qty
     
     def calculate_quantity_for_usdt_value(self, symbol: str, target_usdt_value: float, price: float) -> float:
         """Calculate optimal base currency quantity for a target USDT value"""
         if symbol not in self.instrument_specs:
-            logger.warning(f"No instrument specs cached for {symbol}, calculating basic quantity")
+            logger.warning("No instrument specs cached for %s, calculating basic quantity", symbol)
             return target_usdt_value / price
         
         specs = self.instrument_specs[symbol]
@@ -240,7 +679,7 @@ class BybitClient:
         
         # Ensure we meet minimum notional value
         if target_usdt_value < min_notional:
-            logger.warning(f"Target USDT value ${target_usdt_value:.2f} below minimum notional ${min_notional:.2f}")
+            logger.warning("Target USDT value $%.2f below minimum notional $%.2f", target_usdt_value, min_notional)
             target_usdt_value = min_notional
         
         # Calculate raw quantity
@@ -256,10 +695,42 @@ class BybitClient:
             # Increase quantity to meet minimum notional
             required_quantity = min_notional / price
             rounded_quantity = self.round_quantity(symbol, required_quantity)
-            logger.info(f"Adjusted quantity to meet minimum notional: {final_notional:.2f} -> {rounded_quantity * price:.2f}")
+            logger.info("Adjusted quantity to meet minimum notional: %.2f -> %.2f", final_notional, rounded_quantity * price)
         
         return rounded_quantity
     
+    def _get_validator(self, symbol: str):
+        """Validator for symbol with its limits bound as closure constants
+        
+        Rebuilt whenever instrument_specs[symbol] is replaced (get_instrument_info
+        always stores a fresh dict), so lookups happen once per spec refresh.
+        """
+        specs = self.instrument_specs[symbol]
+        cached = self._validators.get(symbol)
+        if cached is not None and cached[0] is specs:
+            return cached[1]
+        
+        min_qty = specs['min_order_qty']
+        max_qty = specs['max_order_qty']
+        min_notional = specs['min_notional']
+        
+        def validate(quantity: float, price: Optional[float]) -> List[str]:
+            errors = []
+            if quantity <= 0:
+                errors.append("Quantity must be positive")
+            if quantity < min_qty:
+                errors.append(f"Quantity {quantity} below minimum {min_qty}")
+            if max_qty > 0 and quantity > max_qty:
+                errors.append(f"Quantity {quantity} above maximum {max_qty}")
+            if price and min_notional > 0:
+                notional = quantity * price
+                if notional < min_notional:
+                    errors.append(f"Notional value {notional} below minimum {min_notional}")
+            return errors
+        
+        self._validators[symbol] = (specs, validate)
+        return validate
+    
     def validate_order_params(self, symbol: str, quantity: float, price: float = None) -> Dict[str, Any]:
         """Validate order parameters against instrument specifications"""
         validation_result = {
@@ -275,28 +746,11 @@ class BybitClient:
             validation_result['valid'] = False
             return validation_result
         
-        specs = self.instrument_specs[symbol]
-        
-        # Validate quantity
-        if quantity <= 0:
-            validation_result['errors'].append("Quantity must be positive")
+        errors = self._get_validator(symbol)(quantity, price)
+        if errors:
+            validation_result['errors'].extend(errors)
             validation_result['valid'] = False
         
-        if quantity < specs['min_order_qty']:
-            validation_result['errors'].append(f"Quantity {quantity} below minimum {specs['min_order_qty']}")
-            validation_result['valid'] = False
-        
-        if specs['max_order_qty'] > 0 and quantity > specs['max_order_qty']:
-            validation_result['errors'].append(f"Quantity {quantity} above maximum {specs['max_order_qty']}")
-            validation_result['valid'] = False
-        
-        # Check notional value
-        if price and specs['min_notional'] > 0:
-            notional = quantity * price
-            if notional < specs['min_notional']:
-                validation_result['errors'].append(f"Notional value {notional} below minimum {specs['min_notional']}")
-                validation_result['valid'] = False
-        
         # Round quantity to correct precision
         validation_result['corrected_qty'] = self.round_quantity(symbol, quantity)
         
@@ -310,67 +764,85 @@ class BybitClient:
         try:
             # Ensure instrument specs are available
             if symbol not in self.instrument_specs:
-                logger.info(f"Fetching instrument specs for {symbol}")
+                logger.info("Fetching instrument specs for %s", symbol)
                 await self.get_instrument_info(symbol)
             
-            # Validate and correct order parameters
-            validation = self.validate_order_params(symbol, qty, price)
-            
-            if not validation['valid']:
-                error_msg = f"Order validation failed for {symbol}: {'; '.join(validation['errors'])}"
-                logger.error(error_msg)
-                raise ValueError(error_msg)
-            
-            # Use corrected quantity
-            corrected_qty = validation['corrected_qty']
-            
-            if corrected_qty != qty:
-                logger.info(f"Quantity adjusted for {symbol}: {qty} -> {corrected_qty}")
-            
-            params = {
-                'category': 'linear',
-                'symbol': symbol,
-                'side': side,
-                'orderType': order_type,
-                'qty': str(corrected_qty),
-                'timeInForce': 'GTC'  # Good Till Cancelled
-            }
-            
-            if price and order_type != 'Market':
-                params['price'] = str(price)
-            
-            if stop_loss:
-                params['stopLoss'] = str(stop_loss)
-                params['slOrderType'] = 'Market'
-            
-            if take_profit:
-                params['takeProfit'] = str(take_profit)
-                params['tpOrderType'] = 'Market'
-            
-            # Add trailing stop parameters if provided
-            if trailing_stop and trailing_activation:
-                # For shorts: trailing stop moves down as price falls (favorable)
-                # activePrice is when trailing starts, trailingStop is the distance
-                params['activePrice'] = str(trailing_activation)
-                params['trailingStop'] = str(trailing_stop)
-                logger.info(f"Trailing stop set: activation at ${trailing_activation:.4f}, trailing distance ${trailing_stop:.4f}")
-            
-            if stop_loss and take_profit:
-                params['tpslMode'] = 'Full'
-            
-            # Add reduceOnly flag for closing positions
-            if reduce_only:
-                params['reduceOnly'] = True
-                params['timeInForce'] = 'IOC'  # Immediate or Cancel for reduce-only orders
+            params = self._build_order_params(symbol, side, order_type, qty, price, stop_loss,
+                                              take_profit, trailing_stop, trailing_activation, reduce_only)
             
             result = await self._make_request('POST', '/v5/order/create', params)
-            logger.info(f"Order placed successfully: {result}")
+            # Avoid building the result repr when INFO is disabled
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Order placed successfully: %s", result)
             return result
             
         except Exception as e:
             logger.error(f"Failed to place order: {e}")
             raise
     
+    def _build_order_params(self, symbol: str, side: str, order_type: str, qty: float,
+                            price: float = None, stop_loss: float = None,
+                            take_profit: float = None, trailing_stop: float = None,
+                            trailing_activation: float = None, reduce_only: bool = False) -> Dict:
+        """Validate an order against cached instrument specs and build its API params"""
+        # Validate and correct order parameters
+        validation = self.validate_order_params(symbol, qty, price)
+        
+        if not validation['valid']:
+            error_msg = f"Order validation failed for {symbol}: {'; '.join(validation['errors'])}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        
+        # Use corrected quantity
+        corrected_qty = validation['corrected_qty']
+        
+        if corrected_qty != qty:
+            logger.info("Quantity adjusted for %s: %s -> %s", symbol, qty, corrected_qty)
+        
+        # Format numbers at the instrument's precision so the exchange doesn't reject off-grid values
+        specs = self.instrument_specs[symbol]
+        qty_step = specs['qty_step']
+        price_tick = specs['price_tick']
+        
+        params = {
+            'category': 'linear',
+            'symbol': symbol,
+            'side': side,
+            'orderType': order_type,
+            'qty': _format_step(corrected_qty, qty_step),
+            'timeInForce': 'GTC'  # Good Till Cancelled
+        }
+        
+        if price and order_type != 'Market':
+            params['price'] = _format_step(price, price_tick)
+        
+        if stop_loss:
+            params['stopLoss'] = _format_step(stop_loss, price_tick)
+            params['slOrderType'] = 'Market'
+        
+        if take_profit:
+            params['takeProfit'] = _format_step(take_profit, price_tick)
+            params['tpOrderType'] = 'Market'
+        
+        # Add trailing stop parameters if provided
+        if trailing_stop and trailing_activation:
+            # For shorts: trailing stop moves down as price falls (favorable)
+            # activePrice is when trailing starts, trailingStop is the distance
+            params['activePrice'] = _format_step(trailing_activation, price_tick)
+            params['trailingStop'] = _format_step(trailing_stop, price_tick)
+            logger.info("Trailing stop set: activation at $%.4f, trailing distance $%.4f",
+                        trailing_activation, trailing_stop)
+        
+        if stop_loss and take_profit:
+            params['tpslMode'] = 'Full'
+        
+        # Add reduceOnly flag for closing positions
+        if reduce_only:
+            params['reduceOnly'] = True
+            params['timeInForce'] = 'IOC'  # Immediate or Cancel for reduce-only orders
+        
+        return params
+    
     async def cancel_order(self, symbol: str, order_id: str = None, order_link_id: str = None) -> Dict:
         """Cancel an order"""
         try:
@@ -393,39 +865,52 @@ class BybitClient:
             logger.error(f"Failed to cancel order: {e}")
             raise
     
+    async def _iter_pages(self, endpoint: str, params: Dict, max_rows: int = None) -> AsyncIterator[Dict]:
+        """Yield rows from a cursor-paginated endpoint, fetching the next page only when needed"""
+        params = dict(params)
+        rows_yielded = 0
+        while True:
+            result = await self._cached_get(endpoint, params)
+            for row in result.get('list', []):
+                yield row
+                rows_yielded += 1
+                if max_rows is not None and rows_yielded >= max_rows:
+                    return
+            
+            cursor = result.get('nextPageCursor')
+            if not cursor:
+                return
+            params['cursor'] = cursor
+    
+    def iter_order_history(self, symbol: str = None, page_limit: int = 50,
+                           max_rows: int = None) -> AsyncIterator[Dict]:
+        """Stream order history page by page (all pages unless max_rows is given)"""
+        params = {'category': 'linear', 'limit': page_limit}
+        if symbol:
+            params['symbol'] = symbol
+        return self._iter_pages('/v5/order/history', params, max_rows)
+    
+    def iter_execution_history(self, symbol: str = None, page_limit: int = 50,
+                               max_rows: int = None) -> AsyncIterator[Dict]:
+        """Stream execution/trade history page by page (all pages unless max_rows is given)"""
+        params = {'category': 'linear', 'limit': page_limit}
+        if symbol:
+            params['symbol'] = symbol
+        return self._iter_pages('/v5/execution/list', params, max_rows)
+    
     async def get_order_history(self, symbol: str = None, limit: int = 50) -> List[Dict]:
         """Get order history"""
         try:
-            params = {
-                'category': 'linear',
-                'limit': limit
-            }
-            
-            if symbol:
-                params['symbol'] = symbol
-            
-            result = await self._make_request('GET', '/v5/order/history', params)
-            return result.get('list', [])
-            
-        except Exception as e:
+            return [row async for row in self.iter_order_history(symbol, page_limit=limit, max_rows=limit)]
+        except BybitAPIError as e:
             logger.error(f"Failed to get order history: {e}")
             return []
     
     async def get_execution_history(self, symbol: str = None, limit: int = 50) -> List[Dict]:
         """Get execution/trade history"""
         try:
-            params = {
-                'category': 'linear',
-                'limit': limit
-            }
-            
-            if symbol:
-                params['symbol'] = symbol
-            
-            result = await self._make_request('GET', '/v5/execution/list', params)
-            return result.get('list', [])
-            
-        except Exception as e:
+            return [row async for row in self.iter_execution_history(symbol, page_limit=limit, max_rows=limit)]
+        except BybitAPIError as e:
             logger.error(f"Failed to get execution history: {e}")
             return []
     
@@ -462,21 +947,35 @@ class BybitClient:
             logger.error(f"Failed to switch position mode: {e}")
             raise
     
+    @staticmethod
+    def _net_position_size(positions: List[Dict]) -> float:
+        """Signed total size of positions (long positive, short negative), 0.0 when flat"""
+        total_size = sum(
+            POSITION_SIDE_SIGN.get(pos.get('side', ''), 0.0) * float(pos.get('size', 0) or 0)
+            for pos in positions
+        )
+        return total_size if abs(total_size) >= 0.000001 else 0.0
+    
     async def close_position(self, symbol: str) -> Dict:
-        """Close position using Bybit V5 best practices"""
+        """Close position using Bybit V5 best practices
+        
+        The position is taken from the position stream when connected, otherwise fetched.
+        
+        Returns:
+            The order result, or {'status': 'no_position'} once the exchange has
+            confirmed there is nothing to close
+        """
         try:
             # Get current position
-            positions = await self.get_positions(symbol)
+            positions = self.ws.get_positions(symbol) if self.ws is not None else None
+            # A flat stream snapshot may be stale, so only the REST API can confirm no position
+            if positions is None or self._net_position_size(positions) == 0.0:
+                positions = await self._fetch_positions(symbol, ttl=0)
             
-            total_size = 0
-            for pos in positions:
-                size = float(pos.get('size', 0))
-                side = pos.get('side', 'None')
-                if size != 0:
-                    total_size += size if side == 'Buy' else -size
+            total_size = self._net_position_size(positions)
             
-            if abs(total_size) < 0.000001:  # No position to close
-                logger.info(f"No position to close for {symbol}")
+            if total_size == 0.0:  # No position to close
+                logger.info("No position to close for %s", symbol)
                 return {'status': 'no_position'}
             
             # Determine close side
@@ -487,7 +986,7 @@ class BybitClient:
                 close_side = 'Buy'   # Close SHORT
                 close_qty = abs(total_size)
             
-            logger.info(f"Closing {symbol} position: {close_side} {close_qty}")
+            logger.info("Closing %s position: %s %s", symbol, close_side, close_qty)
             
             # Use reduceOnly for proper position closing
             result = await self.place_order(
@@ -498,7 +997,8 @@ class BybitClient:
                 reduce_only=True
             )
             
-            logger.info(f"Position closed successfully: {result}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Position closed successfully: %s", result)
             return result
             
         except Exception as e:
@@ -521,7 +1021,7 @@ class BybitClient:
             result = await self._make_request('GET', '/v5/position/closed-pnl', params)
             return result.get('list', [])
             
-        except Exception as e:
+        except BybitAPIError as e:
             logger.error(f"Failed to get P&L history: {e}")
             return []
     
@@ -550,7 +1050,7 @@ class BybitClient:
             logger.info(f"💰 Daily P&L calculated: ${total_pnl:+.2f} USDT (from {len(pnl_records)} closed positions)")
             return total_pnl
             
-        except Exception as e:
+        except (ValueError, TypeError) as e:
             logger.error(f"Failed to get daily P&L: {e}")
             return 0.0
     
@@ -573,6 +1073,6 @@ class BybitClient:
             logger.info(f"📊 Today's trade count: {trade_count}")
             return trade_count
             
-        except Exception as e:
+        except (ValueError, TypeError) as e:
             logger.error(f"Failed to get trade count: {e}")
             return 0
\ No newline at end of file
@@ -0,0 +1,252 @@
+import asyncio
+import aiohttp
+import orjson
+import time
+import hmac
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# REST host -> (public linear stream, private stream)
+STREAM_URLS = {
+    'https://api.bybit.com': ('wss://stream.bybit.com/v5/public/linear', 'wss://stream.bybit.com/v5/private'),
+    'https://api-testnet.bybit.com': ('wss://stream-testnet.bybit.com/v5/public/linear', 'wss://stream-testnet.bybit.com/v5/private'),
+    'https://api-demo.bybit.com': ('wss://stream.bybit.com/v5/public/linear', 'wss://stream-demo.bybit.com/v5/private'),
+}
+
+# Position stream field -> /v5/position/list field where the names differ
+POSITION_STREAM_FIELDS = {'entryPrice': 'avgPrice'}
+
+def _rest_position_row(position: Dict) -> Dict:
+    """Position stream row with the REST field names added, so both sources read the same"""
+    row = dict(position)
+    for stream_field, rest_field in POSITION_STREAM_FIELDS.items():
+        if stream_field in row and rest_field not in row:
+            row[rest_field] = row[stream_field]
+    return row
+
+class BybitWS:
+    """Live ticker, kline and position snapshots from Bybit V5 WebSocket streams
+
+    Pass an instance to BybitClient(ws=...) so get_ticker/get_klines/get_positions are
+    served from memory while the streams are connected, falling back to REST otherwise.
+    Kline history and positions are seeded from REST by the client; the streams then
+    keep them current.
+    """
+
+    def __init__(self, symbols: List[str], kline_interval: str = '5', max_klines: int = 1000):
+        self.symbols = list(symbols)
+        self.kline_interval = kline_interval
+        self.max_klines = max_klines
+        self.api_key = settings.exchange.api_key
+        self.api_secret = settings.exchange.api_secret
+        self.public_url, self.private_url = STREAM_URLS.get(
+            settings.exchange.base_url.rstrip('/'), STREAM_URLS['https://api.bybit.com']
+        )
+
+        self.ping_interval = 20  # Bybit drops connections without a ping every ~20s
+        self.auth_timeout = 10  # seconds to wait for the private stream's auth reply
+
+        # Snapshots (rows/fields in the same shape as the REST responses)
+        self.ticker_snapshot: Dict[str, Dict] = {}
+        self.kline_snapshot: Dict[Tuple[str, str], List[List[str]]] = {}  # newest bar first
+        self.position_snapshot: Dict[Tuple[str, int], Dict] = {}  # (symbol, positionIdx) -> position
+        self._positions_seeded = set()  # symbols whose full position state is known
+
+        self.public_connected = False
+        self.private_connected = False
+        self.running = False
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        """Connect the streams in background tasks"""
+        if self.running:
+            return
+        self.running = True
+        self._session = aiohttp.ClientSession()
+
+        topics = [f"tickers.{symbol}" for symbol in self.symbols]
+        topics += [f"kline.{self.kline_interval}.{symbol}" for symbol in self.symbols]
+        self._tasks.append(asyncio.create_task(self._run_stream(self.public_url, topics, private=False)))
+
+        if self.api_key and self.api_secret:
+            self._tasks.append(asyncio.create_task(self._run_stream(self.private_url, ['position'], private=True)))
+
+        logger.info(f"📡 Bybit WebSocket streams starting for {', '.join(self.symbols)}")
+
+    async def close(self):
+        """Stop the streams and close the connection"""
+        self.running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self.public_connected = self.private_connected = False
+
+    def get_ticker(self, symbol: str) -> Optional[Dict]:
+        """Latest ticker for symbol, or None if the stream can't provide it"""
+        if not self.public_connected:
+            return None
+        return self.ticker_snapshot.get(symbol)
+
+    def get_klines(self, symbol: str, interval: str, limit: int) -> Optional[List[List[str]]]:
+        """Latest `limit` klines (newest first, REST row format), or None if not enough are held"""
+        if not self.public_connected:
+            return None
+        rows = self.kline_snapshot.get((symbol, interval))
+        if rows is None or len(rows) < limit:
+            return None
+        return rows[:limit]
+
+    def seed_klines(self, symbol: str, interval: str, rows: List[List[str]]):
+        """Load REST kline history that stream updates will be applied on top of"""
+        if interval != self.kline_interval or symbol not in self.symbols or not self.public_connected:
+            return
+        current = self.kline_snapshot.get((symbol, interval))
+        if current is None or len(rows) > len(current):
+            self.kline_snapshot[(symbol, interval)] = [list(row) for row in rows[:self.max_klines]]
+
+    def get_positions(self, symbol: str) -> Optional[List[Dict]]:
+        """Positions for symbol (REST row format), or None if the private stream can't provide them"""
+        if not self.private_connected or symbol not in self._positions_seeded:
+            return None
+        return [position for (pos_symbol, _), position in self.position_snapshot.items() if pos_symbol == symbol]
+    
+    def seed_positions(self, symbol: str, positions: List[Dict]):
+        """Load REST positions for symbol that stream updates will be applied on top of
+        
+        The position topic only pushes changes, so a symbol is served from memory
+        once REST has reported its full state. Newer stream updates are kept.
+        """
+        if not self.private_connected:
+            return
+        for position in positions:
+            key = (symbol, int(position.get('positionIdx', 0)))
+            current = self.position_snapshot.get(key)
+            if current is None or int(current.get('updatedTime') or 0) <= int(position.get('updatedTime') or 0):
+                self.position_snapshot[key] = position
+        self._positions_seeded.add(symbol)
+    
+    def _auth_message(self) -> bytes:
+        expires = int((time.time() + 10) * 1000)
+        signature = hmac.new(self.api_secret.encode('utf-8'), f"GET/realtime{expires}".encode('utf-8'),
+                             digestmod='sha256').hexdigest()
+        return orjson.dumps({'op': 'auth', 'args': [self.api_key, expires, signature]})
+
+    async def _authenticate(self, ws) -> bool:
+        """Send the auth request and wait for its reply; True if Bybit accepted it"""
+        await ws.send_bytes(self._auth_message())
+        try:
+            return await asyncio.wait_for(self._auth_reply(ws), self.auth_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"No WebSocket auth reply within {self.auth_timeout}s")
+            return False
+
+    async def _auth_reply(self, ws) -> bool:
+        async for msg in ws:
+            if msg.type not in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                break
+            reply = orjson.loads(msg.data)
+            if reply.get('op') == 'auth':
+                if reply.get('success'):
+                    return True
+                logger.error(f"WebSocket authentication failed: {reply}")
+                break
+        return False
+
+    async def _run_stream(self, url: str, topics: List[str], private: bool):
+        """Keep one stream connected, reconnecting with backoff"""
+        attempt = 0
+        while self.running:
+            try:
+                async with self._session.ws_connect(url, heartbeat=None) as ws:
+                    # Positions are only trusted once Bybit has accepted the credentials
+                    if private and not await self._authenticate(ws):
+                        raise ConnectionError("authentication failed")
+                    # Bybit accepts at most 10 args per subscribe request
+                    for i in range(0, len(topics), 10):
+                        await ws.send_bytes(orjson.dumps({'op': 'subscribe', 'args': topics[i:i + 10]}))
+
+                    self._set_connected(private, True)
+                    attempt = 0
+                    logger.info(f"📡 Connected to {url}")
+
+                    ping_task = asyncio.create_task(self._ping(ws))
+                    try:
+                        async for msg in ws:
+                            if msg.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                                self._handle_message(orjson.loads(msg.data))
+                            elif msg.type == aiohttp.WSMsgType.ERROR:
+                                break
+                    finally:
+                        ping_task.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"WebSocket error on {url}: {e}")
+
+            self._set_connected(private, False)
+            if self.running:
+                delay = min(30, 2 ** attempt)
+                attempt += 1
+                logger.warning(f"WebSocket {url} disconnected, reconnecting in {delay}s")
+                await asyncio.sleep(delay)
+
+    def _set_connected(self, private: bool, connected: bool):
+        if private:
+            self.private_connected = connected
+            if not connected:
+                self.position_snapshot.clear()
+                self._positions_seeded.clear()
+            return
+        self.public_connected = connected
+        if not connected:
+            # Updates are lost while disconnected; drop snapshots so callers fall back to REST
+            self.ticker_snapshot.clear()
+            self.kline_snapshot.clear()
+
+    async def _ping(self, ws):
+        ping = orjson.dumps({'op': 'ping'})
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await ws.send_bytes(ping)
+
+    def _handle_message(self, message: Dict):
+        topic = message.get('topic')
+        if not topic:
+            # Command responses (subscribe/auth/pong)
+            if message.get('success') is False:
+                logger.error(f"WebSocket request failed: {message}")
+            return
+
+        data = message.get('data')
+        if topic.startswith('tickers.'):
+            symbol = data.get('symbol')
+            if message.get('type') == 'snapshot' or symbol not in self.ticker_snapshot:
+                self.ticker_snapshot[symbol] = dict(data)
+            else:
+                self.ticker_snapshot[symbol].update(data)
+        elif topic.startswith('kline.'):
+            _, interval, symbol = topic.split('.', 2)
+            rows = self.kline_snapshot.get((symbol, interval))
+            if rows is None:
+                return  # not seeded yet
+            for bar in data:
+                row = [str(bar['start']), bar['open'], bar['high'], bar['low'],
+                       bar['close'], bar['volume'], bar['turnover']]
+                if rows and rows[0][0] == row[0]:
+                    rows[0] = row
+                elif not rows or int(row[0]) > int(rows[0][0]):
+                    rows.insert(0, row)
+                    del rows[self.max_klines:]
+        elif topic == 'position':
+            for position in data:
+                key = (position.get('symbol'), int(position.get('positionIdx', 0)))
+                self.position_snapshot[key] = _rest_position_row(position)
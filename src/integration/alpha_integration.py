@@ -5,6 +5,9 @@ Integrates with shared PostgreSQL and Redis services
 
 import sys
 import os
+import asyncio
+import functools
+import threading
 from pathlib import Path
 import logging
 from datetime import datetime
@@ -19,6 +22,20 @@ from shared.alpha_db_client import AlphaDBClient, create_client_order_id
 logger = logging.getLogger(__name__)
 
 
+def _db_serialized(method):
+    """Run method holding the integration's DB lock.
+
+    Fills and position updates are written from worker threads while other calls
+    run on the event loop thread, and AlphaDBClient is not known to be thread-safe,
+    so every use of db_client goes through this lock.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._db_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class ShortSellerAlphaIntegration:
     """
     Integration layer between ShortSeller strategy and Alpha infrastructure.
@@ -39,6 +56,15 @@ class ShortSellerAlphaIntegration:
         """
         self.bot_id = bot_id
         self.db_client = None
+        # Serializes db_client use across the event loop thread and writer threads
+        self._db_lock = threading.RLock()
+        # Fills are written by a background task so DB latency stays off the order path
+        self._fill_queue: Optional[asyncio.Queue] = None
+        self._fill_writer: Optional[asyncio.Task] = None
+        # Latest unwritten Redis position state per symbol, flushed every position_flush_interval
+        self.position_flush_interval = 0.02
+        self._pending_positions: Dict[str, Dict] = {}
+        self._position_flusher: Optional[asyncio.Task] = None
         self._initialize_db_client()
 
     def _initialize_db_client(self):
@@ -62,6 +88,7 @@ class ShortSellerAlphaIntegration:
     # TRADE TRACKING (Integrates with trade_tracker)
     # ========================================
 
+    @_db_serialized
     def log_trade_opened(
         self,
         symbol: str,
@@ -153,6 +180,7 @@ class ShortSellerAlphaIntegration:
             traceback.print_exc()
             return False
 
+    @_db_serialized
     def log_trade_closed(
         self,
         symbol: str,
@@ -250,23 +278,90 @@ class ShortSellerAlphaIntegration:
     # COMPATIBILITY METHODS
     # ========================================
 
-    def record_fill(self, symbol: str, side: str, price: float, quantity: float,
-                    order_id: str = None, fee: float = 0.0, timestamp: datetime = None):
+    def record_fill(self, symbol: str, side: str, price: float = None, quantity: float = None,
+                    order_id: str = None, fee: float = 0.0, timestamp: datetime = None,
+                    exec_price: float = None, exec_qty: float = None, close_reason: str = 'fill',
+                    commission: float = None):
         """
         Compatibility method for ShortSeller bot.
-        Alias for write_fill with compatible parameter names.
+        Alias for write_fill with compatible parameter names (write_fill's
+        exec_price/exec_qty/close_reason/commission names are accepted too).
+
+        Inside a running event loop the fill is queued and written in order by a
+        background task, so the caller never waits on PostgreSQL; call flush()
+        before shutdown. If the queue is full the fill is logged and dropped.
+        Without a loop it is written immediately.
+
+        Returns:
+            write_fill result when written immediately, otherwise None
         """
-        return self.db_client.write_fill(
-            symbol=symbol,
-            side=side,
-            exec_price=price,
-            exec_qty=quantity,
-            order_id=order_id or f"shortseller_{symbol}_{int(datetime.utcnow().timestamp())}",
-            client_order_id=f"shortseller_{side.lower()}_{int(datetime.utcnow().timestamp())}",
-            close_reason='fill',
-            commission=fee,
-            exec_time=timestamp or datetime.utcnow()
-        )
+        if not self.db_client:
+            return None
+
+        now = datetime.utcnow()
+        fill = {
+            'symbol': symbol,
+            'side': side,
+            'exec_price': exec_price if exec_price is not None else price,
+            'exec_qty': exec_qty if exec_qty is not None else quantity,
+            'order_id': order_id or f"shortseller_{symbol}_{int(now.timestamp())}",
+            'client_order_id': f"shortseller_{side.lower()}_{int(now.timestamp())}",
+            'close_reason': close_reason,
+            'commission': commission if commission is not None else fee,
+            'exec_time': timestamp or now
+        }
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._write_fill(fill)
+
+        if self._fill_queue is None:
+            self._fill_queue = asyncio.Queue(maxsize=10_000)
+        if self._fill_writer is None or self._fill_writer.done():
+            self._fill_writer = loop.create_task(self._fill_writer_loop())
+
+        try:
+            self._fill_queue.put_nowait(fill)
+        except asyncio.QueueFull:
+            # Writing it inline would put it in the DB ahead of older queued fills
+            logger.error(f"❌ Fill queue full, dropping fill: {fill}")
+        return None
+
+    @_db_serialized
+    def _write_fill(self, fill: Dict):
+        """Write one fill, logging instead of raising on failure."""
+        try:
+            return self.db_client.write_fill(**fill)
+        except Exception as e:
+            logger.error(f"❌ Failed to write fill for {fill.get('symbol')}: {e}")
+            return None
+
+    async def _fill_writer_loop(self):
+        """Drain queued fills in order, running the blocking write in a worker thread."""
+        while True:
+            fill = await self._fill_queue.get()
+            try:
+                await asyncio.to_thread(self._write_fill, fill)
+            finally:
+                self._fill_queue.task_done()
+
+    async def flush(self):
+        """Write everything still queued (positions and fills); call before shutdown."""
+        await self.flush_positions()
+        await self.flush_fills()
+
+    async def flush_fills(self):
+        """Wait until all queued fills are written, then stop the writer task."""
+        if self._fill_queue is not None and self._fill_writer is not None and not self._fill_writer.done():
+            await self._fill_queue.join()
+        if self._fill_writer is not None:
+            self._fill_writer.cancel()
+            try:
+                await self._fill_writer
+            except asyncio.CancelledError:
+                pass
+            self._fill_writer = None
 
     # ========================================
     # POSITION MANAGEMENT
@@ -283,6 +378,10 @@ class ShortSellerAlphaIntegration:
         """
         Update position state in Redis.
 
+        Inside a running event loop updates are coalesced: only the latest state
+        per symbol is kept and written by a background task shortly after, so
+        bursts of updates cost one Redis write per symbol.
+
         Args:
             symbol: Trading pair
             size: Position size (0 = flat)
@@ -293,20 +392,50 @@ class ShortSellerAlphaIntegration:
         if not self.db_client:
             return
 
+        update = {
+            'symbol': symbol,
+            'size': size,
+            'side': side,
+            'avg_price': avg_price,
+            'unrealized_pnl': unrealized_pnl
+        }
+
         try:
-            self.db_client.update_position_redis(
-                symbol=symbol,
-                size=size,
-                side=side,
-                avg_price=avg_price,
-                unrealized_pnl=unrealized_pnl
-            )
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_position(update)
+            return
 
-            logger.debug(f"📊 Redis position updated: {symbol} = {size}")
+        self._pending_positions[symbol] = update
+        if self._position_flusher is None or self._position_flusher.done():
+            self._position_flusher = loop.create_task(self._flush_positions_later())
 
+    @_db_serialized
+    def _write_position(self, update: Dict):
+        """Write one position state to Redis, logging instead of raising on failure."""
+        try:
+            self.db_client.update_position_redis(**update)
+            logger.debug("📊 Redis position updated: %s = %s", update['symbol'], update['size'])
         except Exception as e:
             logger.error(f"❌ Failed to update Redis position: {e}")
 
+    async def _flush_positions_later(self):
+        """Write pending position states after the coalescing window."""
+        await asyncio.sleep(self.position_flush_interval)
+        await self.flush_positions()
+
+    async def flush_positions(self):
+        """Write all pending position states now."""
+        pending, self._pending_positions = self._pending_positions, {}
+        if pending:
+            await asyncio.to_thread(self._write_positions, list(pending.values()))
+
+    def _write_positions(self, updates):
+        """Write several position states (runs in a worker thread)."""
+        for update in updates:
+            self._write_position(update)
+
+    @_db_serialized
     def get_position(self, symbol: str) -> Optional[Dict]:
         """
         Get current position from Redis.
@@ -320,6 +449,11 @@ class ShortSellerAlphaIntegration:
         if not self.db_client:
             return None
 
+        # Don't read back a state older than an update still waiting to be flushed
+        pending = self._pending_positions.pop(symbol, None)
+        if pending is not None:
+            self._write_position(pending)
+
         try:
             return self.db_client.get_position_redis(symbol)
         except Exception as e:
@@ -330,6 +464,7 @@ class ShortSellerAlphaIntegration:
     # HEARTBEAT & STATUS
     # ========================================
 
+    @_db_serialized
     def send_heartbeat(self):
         """Send heartbeat to bot registry."""
         if not self.db_client:
@@ -337,10 +472,11 @@ class ShortSellerAlphaIntegration:
 
         try:
             self.db_client.update_heartbeat()
-            logger.debug(f"💓 Heartbeat sent for {self.bot_id}")
+            logger.debug("💓 Heartbeat sent for %s", self.bot_id)
         except Exception as e:
-            logger.debug(f"Failed to send heartbeat: {e}")
+            logger.debug("Failed to send heartbeat: %s", e)
 
+    @_db_serialized
     def update_equity(self, equity: float):
         """Update current equity in bot registry."""
         if not self.db_client:
@@ -348,14 +484,17 @@ class ShortSellerAlphaIntegration:
 
         try:
             self.db_client.update_equity(equity)
-            logger.debug(f"💰 Equity updated: ${equity:,.2f}")
+            # Thousands separator needs a format spec %-style can't express; only build it when logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("💰 Equity updated: $%s", f"{equity:,.2f}")
         except Exception as e:
-            logger.debug(f"Failed to update equity: {e}")
+            logger.debug("Failed to update equity: %s", e)
 
     # ========================================
     # PERFORMANCE QUERIES
     # ========================================
 
+    @_db_serialized
     def get_daily_pnl(self, days: int = 1) -> float:
         """Get P&L for last N days."""
         if not self.db_client:
@@ -366,6 +505,7 @@ class ShortSellerAlphaIntegration:
         except:
             return 0.0
 
+    @_db_serialized
     def get_trade_count_today(self) -> int:
         """Get number of trades today."""
         if not self.db_client:
@@ -380,6 +520,7 @@ class ShortSellerAlphaIntegration:
     # CLEANUP
     # ========================================
 
+    @_db_serialized
     def close(self):
         """Close database connections."""
         if self.db_client:
@@ -392,6 +533,7 @@ class ShortSellerAlphaIntegration:
 
 # Singleton instance for easy import
 _integration = None
+_integration_lock = threading.Lock()
 
 
 def get_integration(bot_id: str = 'shortseller_001') -> ShortSellerAlphaIntegration:
@@ -406,5 +548,8 @@ def get_integration(bot_id: str = 'shortseller_001') -> ShortSellerAlphaIntegrat
     """
     global _integration
     if _integration is None:
-        _integration = ShortSellerAlphaIntegration(bot_id=bot_id)
+        # Only one caller may create it (each instance opens its own DB/Redis connections)
+        with _integration_lock:
+            if _integration is None:
+                _integration = ShortSellerAlphaIntegration(bot_id=bot_id)
     return _integration
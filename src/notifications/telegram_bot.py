@@ -1,26 +1,121 @@
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timezone
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Any
+from datetime import datetime, timezone, timedelta
 import json
 from dataclasses import dataclass
+from functools import lru_cache
 
 from telegram import Bot
 from telegram.constants import ParseMode
-from telegram.error import TelegramError
+from telegram.error import TelegramError, RetryAfter
+from telegram.request import HTTPXRequest
 
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
-@dataclass
-class TradingNotification:
+# Per-asset message fragments for the configured assets (others are built on the fly)
+_ASSET_HEADER = {asset: f"📊 <b>{asset} SHORT POSITION</b>" for asset in settings.get_asset_symbols()}
+_ASSET_HASHTAG = {asset: f"#{asset}" for asset in settings.get_asset_symbols()}
+
+@lru_cache(maxsize=2)
+def _utc_hms(epoch_second: int) -> str:
+    """'HH:MM:SS UTC' for a whole epoch second; bursts within one second share the string"""
+    return datetime.fromtimestamp(epoch_second, timezone.utc).strftime('%H:%M:%S UTC')
+
+def _format_time(timestamp: datetime) -> str:
+    """Message timestamp as 'HH:MM:SS UTC'"""
+    if timestamp.utcoffset() == timedelta(0):
+        return _utc_hms(int(timestamp.timestamp()))
+    # Naive or non-UTC timestamps are shown as-is, as before
+    return timestamp.strftime('%H:%M:%S UTC')
+
+_NL = "\n"
+
+# send_message options shared by every queued message (never mutated)
+_PARSE_MODE_HTML = ParseMode.HTML
+_SEND_KWARGS = {'parse_mode': _PARSE_MODE_HTML, 'disable_web_page_preview': True}
+
+# Queued messages for the same chat are sent joined, within Telegram's length limit
+_BATCH_SEPARATOR = "\n\n---\n\n"
+_MAX_MESSAGE_LENGTH = 4096
+
+# Regime change wording, chosen by whether the new regime is ACTIVE:
+# (status emoji, change emoji, status text, description, price position, strategy note)
+_REGIME_CHANGE_TONE = {
+    True: ("🟢", "📈", "FAVORABLE FOR SHORTING",
+           "Market conditions now optimal for short position opportunities",
+           "Below both EMAs", "Monitor for potential SHORT signals"),
+    False: ("🔴", "📉", "UNFAVORABLE FOR SHORTING",
+            "Market conditions no longer optimal for shorting",
+            "Above EMAs", "Reduced shorting opportunities")
+}
+
+class TradingNotification(NamedTuple):
     message_type: str  # 'entry', 'exit', 'regime_change', 'status'
     asset: str
     price: float
     signal_type: str
     timestamp: datetime
-    metadata: Dict[str, Any] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+@dataclass
+class OutgoingMessage:
+    chat_id: Any
+    text: str
+    options: Dict[str, Any]  # extra send_message keyword arguments
+    description: str  # what is being sent, for logs
+
+@lru_cache(maxsize=256)
+def _render_system_status(balance: float, active_positions: int, daily_pnl: float, total_trades: int,
+                          assets: tuple) -> str:
+    """System status message for hashable inputs; reports with unchanged inputs are reused
+
+    Args:
+        assets: (asset, regime, in cooldown, cooldown reason, cooldown remaining)
+            per asset, in display order
+    """
+    regime_summary = []
+    cooldown_summary = []
+    
+    for asset, regime, in_cooldown, cooldown_reason, cooldown_remaining in assets:
+        emoji = "🟢" if regime == 'ACTIVE' else "🔴"
+        regime_summary.append(f"{emoji} {asset}: {regime}")
+        
+        if in_cooldown:
+            cooldown_summary.append(
+                f"🕒 {asset}: {cooldown_reason} "
+                f"({cooldown_remaining} remaining)"
+            )
+    
+    cooldown_block = ""
+    if cooldown_summary:
+        cooldown_block = f"🕒 <b>Asset Cooldowns:</b>\n{_NL.join(cooldown_summary)}\n\n"
+    
+    message = f"""📊 <b>DAILY TRADING REPORT</b>
+
+💰 <b>Portfolio Status:</b>
+• Account Balance: ${balance:,.2f} USDT
+• Active Positions: {active_positions}
+• Daily P&L: ${daily_pnl:+,.2f} USDT
+• Total Trades Today: {total_trades}
+
+📈 <b>Market Regimes:</b>
+{_NL.join(regime_summary)}
+
+{cooldown_block}🎯 <b>Strategy Update:</b>
+Multi-asset EMA crossover system running smoothly
+Monitoring BTC, ETH, SOL for bearish signals
+Following systematic approach with proper risk management
+
+Keep following the community for live trade updates!
+
+#DailyReport #Trading #MultiAsset #Strategy"""
+
+    return message
 
 class TelegramCommunityBot:
     """
@@ -35,8 +130,22 @@ class TelegramCommunityBot:
         self.bot = None
         self.enabled = bool(self.bot_token and self.channel_id)
         
+        # Outgoing messages are queued and sent by one dispatcher task, so callers
+        # don't wait on Telegram and sends stay under its ~1 message/second per chat limit
+        self.chat_interval = 1.0
+        self._outbox: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._last_sent: Dict[Any, float] = {}
+        
+        # Regime change notifications recently sent, to drop repeats
+        # when price oscillates around an EMA: key -> monotonic time sent
+        self.duplicate_window = 30.0
+        self._recent: OrderedDict = OrderedDict()
+        
         if self.enabled:
-            self.bot = Bot(token=self.bot_token)
+            # One pooled keep-alive HTTP client for all sends (older library versions default to a single connection)
+            request = HTTPXRequest(connection_pool_size=8, connect_timeout=5.0, read_timeout=10.0)
+            self.bot = Bot(token=self.bot_token, request=request)
             logger.info("🤖 Telegram bot initialized")
         else:
             logger.warning("⚠️ Telegram bot disabled - missing token or channel ID")
@@ -48,14 +157,14 @@ class TelegramCommunityBot:
             
         try:
             bot_info = await self.bot.get_me()
-            logger.info(f"✅ Telegram bot connected: @{bot_info.username}")
+            logger.info("✅ Telegram bot connected: @%s", bot_info.username)
             
             # Test message to admin if configured
             if self.admin_chat_id:
                 await self.bot.send_message(
                     chat_id=self.admin_chat_id,
                     text="🤖 <b>Multi-Asset Trading Bot Online</b>\n\nBot successfully connected and ready to send community notifications.",
-                    parse_mode=ParseMode.HTML
+                    parse_mode=_PARSE_MODE_HTML
                 )
             
             return True
@@ -79,11 +188,20 @@ class TelegramCommunityBot:
         trailing_stop_pct = metadata.get('trailing_stop_pct', 2.0)
         trailing_activation_pct = metadata.get('trailing_activation_pct', 2.0)
         
+        # Price levels computed once up front rather than inside the message
+        price = notification.price
+        stop_loss_price = price * (1 + stop_loss_pct / 100)
+        take_profit_price = price * (1 - take_profit_pct / 100)
+        risk_reward = take_profit_pct / stop_loss_pct
+        
+        header = _ASSET_HEADER.get(notification.asset) or f"📊 <b>{notification.asset} SHORT POSITION</b>"
+        hashtag = _ASSET_HASHTAG.get(notification.asset) or f"#{notification.asset}"
+        
         message = f"""🚨 <b>TRADE SIGNAL ALERT</b> 🚨
 
-📊 <b>{notification.asset} SHORT POSITION</b>
-💰 Entry Price: <b>${notification.price:,.2f}</b>
-⏰ Time: {notification.timestamp.strftime('%H:%M:%S UTC')}
+{header}
+💰 Entry Price: <b>${price:,.2f}</b>
+⏰ Time: {_format_time(notification.timestamp)}
 
 📈 <b>Technical Analysis:</b>
 • EMA 240: ${ema_240:,.2f}
@@ -93,17 +211,17 @@ class TelegramCommunityBot:
 
 🎯 <b>Trade Setup:</b>
 • Direction: SHORT ⬇️
-• Stop Loss: {stop_loss_pct}% (${notification.price * (1 + stop_loss_pct/100):,.2f})
-• Take Profit: {take_profit_pct}% (${notification.price * (1 - take_profit_pct/100):,.2f})
+• Stop Loss: {stop_loss_pct}% (${stop_loss_price:,.2f})
+• Take Profit: {take_profit_pct}% (${take_profit_price:,.2f})
 • Trailing Stop: {trailing_stop_pct}% at {trailing_activation_pct}% profit
-• Risk/Reward: 1:{take_profit_pct/stop_loss_pct:.1f}
+• Risk/Reward: 1:{risk_reward:.1f}
 
 ⚠️ <b>Risk Management:</b>
 Position size according to portfolio allocation rules
 Maximum exposure per asset maintained
 Always use proper risk management
 
-#Trading #{notification.asset} #TechnicalAnalysis #EMAStrategy"""
+#Trading {hashtag} #TechnicalAnalysis #EMAStrategy"""
 
         return message
     
@@ -121,11 +239,14 @@ Always use proper risk management
         profit_emoji = "🟢" if pnl > 0 else "🔴"
         result_text = "PROFIT" if pnl > 0 else "LOSS"
         
+        header = _ASSET_HEADER.get(notification.asset) or f"📊 <b>{notification.asset} SHORT POSITION</b>"
+        hashtag = _ASSET_HASHTAG.get(notification.asset) or f"#{notification.asset}"
+        
         message = f"""🏁 <b>POSITION CLOSED</b> {profit_emoji}
 
-📊 <b>{notification.asset} SHORT POSITION</b>
+{header}
 💰 Exit Price: <b>${notification.price:,.2f}</b>
-⏰ Time: {notification.timestamp.strftime('%H:%M:%S UTC')}
+⏰ Time: {_format_time(notification.timestamp)}
 
 📈 <b>Trade Summary:</b>
 • Entry Price: ${entry_price:,.2f}
@@ -142,62 +263,29 @@ Always use proper risk management
 Another trade completed using our systematic approach
 Keep following risk management principles!
 
-#TradeUpdate #{notification.asset} #Results #{result_text}"""
+#TradeUpdate {hashtag} #Results #{result_text}"""
 
         return message
     
     
     def format_system_status_message(self, status_data: Dict[str, Any]) -> str:
         """Format system status update for community"""
-        
-        balance = status_data.get('balance', 0)
-        active_positions = status_data.get('active_positions', 0)
-        daily_pnl = status_data.get('daily_pnl', 0)
-        total_trades = status_data.get('total_trades', 0)
-        
-        # Asset regimes
-        asset_status = status_data.get('assets_status', {})
-        
-        regime_summary = []
-        cooldown_summary = []
-        
-        for asset, data in asset_status.items():
-            regime = data.get('regime', 'UNKNOWN')
-            emoji = "🟢" if regime == 'ACTIVE' else "🔴"
-            regime_summary.append(f"{emoji} {asset}: {regime}")
-            
-            # Check cooldown status
+        assets = []
+        for asset, data in status_data.get('assets_status', {}).items():
             cooldown_status = data.get('cooldown_status', {})
             if cooldown_status.get('in_cooldown', False):
-                cooldown_summary.append(
-                    f"🕒 {asset}: {cooldown_status['reason']} "
-                    f"({cooldown_status['remaining_formatted']} remaining)"
-                )
+                assets.append((asset, data.get('regime', 'UNKNOWN'), True,
+                               cooldown_status['reason'], cooldown_status['remaining_formatted']))
+            else:
+                assets.append((asset, data.get('regime', 'UNKNOWN'), False, None, None))
         
-        message = f"""📊 <b>DAILY TRADING REPORT</b>
-
-💰 <b>Portfolio Status:</b>
-• Account Balance: ${balance:,.2f} USDT
-• Active Positions: {active_positions}
-• Daily P&L: ${daily_pnl:+,.2f} USDT
-• Total Trades Today: {total_trades}
-
-📈 <b>Market Regimes:</b>
-{chr(10).join(regime_summary)}
-
-{f'''🕒 <b>Asset Cooldowns:</b>
-{chr(10).join(cooldown_summary)}
-
-''' if cooldown_summary else ''}🎯 <b>Strategy Update:</b>
-Multi-asset EMA crossover system running smoothly
-Monitoring BTC, ETH, SOL for bearish signals
-Following systematic approach with proper risk management
-
-Keep following the community for live trade updates!
-
-#DailyReport #Trading #MultiAsset #Strategy"""
-
-        return message
+        return _render_system_status(
+            status_data.get('balance', 0),
+            status_data.get('active_positions', 0),
+            status_data.get('daily_pnl', 0),
+            status_data.get('total_trades', 0),
+            tuple(assets)
+        )
     
     def format_regime_change_message(self, notification: TradingNotification) -> str:
         """Format regime change notification for community"""
@@ -209,22 +297,16 @@ Keep following the community for live trade updates!
         ema_600 = metadata.get('ema_600', 0)
         
         # Determine emoji and message tone based on regime change
-        if current_regime == 'ACTIVE':
-            status_emoji = "🟢"
-            change_emoji = "📈"
-            status_text = "FAVORABLE FOR SHORTING"
-            description = "Market conditions now optimal for short position opportunities"
-        else:
-            status_emoji = "🔴"
-            change_emoji = "📉"
-            status_text = "UNFAVORABLE FOR SHORTING"
-            description = "Market conditions no longer optimal for shorting"
+        (status_emoji, change_emoji, status_text, description,
+         price_position, strategy_note) = _REGIME_CHANGE_TONE[current_regime == 'ACTIVE']
+        
+        hashtag = _ASSET_HASHTAG.get(notification.asset) or f"#{notification.asset}"
         
         message = f"""📊 <b>REGIME CHANGE ALERT</b> {change_emoji}
 
 {status_emoji} <b>{notification.asset} - {status_text}</b>
 💰 Current Price: <b>${notification.price:,.2f}</b>
-⏰ Time: {notification.timestamp.strftime('%H:%M:%S UTC')}
+⏰ Time: {_format_time(notification.timestamp)}
 
 🔄 <b>Regime Update:</b>
 • Previous: {previous_regime}
@@ -233,51 +315,73 @@ Keep following the community for live trade updates!
 📈 <b>Technical Context:</b>
 • EMA 240: ${ema_240:,.2f}
 • EMA 600: ${ema_600:,.2f}
-• Price Position: {"Below both EMAs" if current_regime == 'ACTIVE' else "Above EMAs"}
+• Price Position: {price_position}
 
 📝 <b>Impact:</b>
 {description}
 
 🎯 <b>Strategy Note:</b>
-{"Monitor for potential SHORT signals" if current_regime == 'ACTIVE' else "Reduced shorting opportunities"}
+{strategy_note}
 
-#{notification.asset} #RegimeChange #MarketConditions #Strategy"""
+{hashtag} #RegimeChange #MarketConditions #Strategy"""
 
         return message
     
+    # message_type -> formatter
+    _FORMATTERS = {
+        'entry': format_trade_entry_message,
+        'exit': format_trade_exit_message,
+        'regime_change': format_regime_change_message
+    }
+    
     async def send_trade_notification(self, notification: TradingNotification):
         """Send trade notification to community channel"""
         if not self.enabled:
             logger.debug("Telegram notifications disabled")
             return
         
+        if self._is_duplicate(notification):
+            logger.debug("Skipping duplicate %s notification for %s", notification.message_type, notification.asset)
+            return
+        
         try:
             # Format message based on type
-            if notification.message_type == 'entry':
-                message = self.format_trade_entry_message(notification)
-            elif notification.message_type == 'exit':
-                message = self.format_trade_exit_message(notification)
-            elif notification.message_type == 'regime_change':
-                message = self.format_regime_change_message(notification)
-            else:
-                logger.warning(f"Unknown notification type: {notification.message_type}")
+            formatter = self._FORMATTERS.get(notification.message_type)
+            if formatter is None:
+                logger.warning("Unknown notification type: %s", notification.message_type)
                 return
+            message = formatter(self, notification)
             
-            # Send to community channel
-            await self.bot.send_message(
+            # Queue for the community channel
+            self._enqueue(OutgoingMessage(
                 chat_id=self.channel_id,
                 text=message,
-                parse_mode=ParseMode.HTML,
-                disable_web_page_preview=True
-            )
-            
-            logger.info(f"📱 Telegram notification sent: {notification.message_type} for {notification.asset}")
+                options=_SEND_KWARGS,
+                description=f"notification: {notification.message_type} for {notification.asset}"
+            ))
             
-        except TelegramError as e:
-            logger.error(f"❌ Failed to send Telegram notification: {e}")
         except Exception as e:
             logger.error(f"❌ Unexpected error sending notification: {e}")
     
+    def _is_duplicate(self, notification: TradingNotification) -> bool:
+        """True if the same regime change was sent within duplicate_window"""
+        if notification.message_type != 'regime_change':
+            return False
+        
+        metadata = notification.metadata or {}
+        key = (notification.message_type, notification.asset, round(notification.price, 2),
+               metadata.get('current_regime'))
+        now = time.monotonic()
+        sent_at = self._recent.get(key)
+        if sent_at is not None and now - sent_at < self.duplicate_window:
+            return True
+        
+        self._recent[key] = now
+        self._recent.move_to_end(key)
+        while len(self._recent) > 128:
+            self._recent.popitem(last=False)
+        return False
+    
     async def send_system_status(self, status_data: Dict[str, Any]):
         """Send system status update"""
         if not self.enabled:
@@ -286,18 +390,108 @@ Keep following the community for live trade updates!
         try:
             message = self.format_system_status_message(status_data)
             
-            await self.bot.send_message(
+            self._enqueue(OutgoingMessage(
                 chat_id=self.channel_id,
                 text=message,
-                parse_mode=ParseMode.HTML,
-                disable_web_page_preview=True
-            )
-            
-            logger.info("📱 System status sent to Telegram")
+                options=_SEND_KWARGS,
+                description="system status"
+            ))
             
-        except TelegramError as e:
+        except Exception as e:
             logger.error(f"❌ Failed to send system status: {e}")
     
+    def _enqueue(self, outgoing: OutgoingMessage):
+        """Queue a message for the dispatcher, starting it if needed"""
+        if self._outbox is None:
+            self._outbox = asyncio.Queue(maxsize=1000)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        try:
+            self._outbox.put_nowait(outgoing)
+        except asyncio.QueueFull:
+            logger.error(f"❌ Telegram outbox full, dropping {outgoing.description}")
+    
+    async def _dispatch(self):
+        """Send queued messages in order, pacing each chat to chat_interval
+        
+        A message that is alone in the queue goes out as soon as its chat allows.
+        Messages queued behind it for the same chat are joined into one send,
+        up to Telegram's message length limit.
+        """
+        held = None  # taken from the queue but not mergeable into the previous send
+        while True:
+            if held is not None:
+                outgoing, held = held, None
+            else:
+                outgoing = await self._outbox.get()
+            batch = [outgoing]
+            try:
+                wait = self._last_sent.get(outgoing.chat_id, 0.0) + self.chat_interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                
+                length = len(outgoing.text)
+                while not self._outbox.empty():
+                    queued = self._outbox.get_nowait()
+                    length += len(_BATCH_SEPARATOR) + len(queued.text)
+                    if (queued.chat_id != outgoing.chat_id or queued.options != outgoing.options
+                            or length > _MAX_MESSAGE_LENGTH):
+                        held = queued
+                        break
+                    batch.append(queued)
+                
+                if len(batch) > 1:
+                    outgoing = OutgoingMessage(
+                        chat_id=outgoing.chat_id,
+                        text=_BATCH_SEPARATOR.join(queued.text for queued in batch),
+                        options=outgoing.options,
+                        description=f"batch of {len(batch)} ({', '.join(queued.description for queued in batch)})"
+                    )
+                await self._deliver(outgoing)
+            finally:
+                for _ in batch:
+                    self._outbox.task_done()
+    
+    async def _deliver(self, outgoing: OutgoingMessage, retry: bool = True):
+        """Send one message, waiting out a flood-control response once"""
+        try:
+            await self.bot.send_message(chat_id=outgoing.chat_id, text=outgoing.text, **outgoing.options)
+            logger.info("📱 Telegram %s sent", outgoing.description)
+        except RetryAfter as e:
+            delay = e.retry_after
+            if isinstance(delay, timedelta):
+                delay = delay.total_seconds()
+            if retry:
+                logger.warning("⚠️ Telegram flood control, retrying %s in %ss", outgoing.description, delay)
+                await asyncio.sleep(delay)
+                await self._deliver(outgoing, retry=False)
+            else:
+                logger.error(f"❌ Failed to send Telegram {outgoing.description}: {e}")
+        except TelegramError as e:
+            logger.error(f"❌ Failed to send Telegram {outgoing.description}: {e}")
+        except Exception as e:
+            logger.error(f"❌ Unexpected error sending Telegram {outgoing.description}: {e}")
+        finally:
+            self._last_sent[outgoing.chat_id] = time.monotonic()
+    
+    async def flush(self):
+        """Wait until queued messages are sent, then stop the dispatcher"""
+        if self._outbox is not None and self._dispatcher is not None and not self._dispatcher.done():
+            await self._outbox.join()
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+    
+    async def aclose(self):
+        """Send anything still queued and close the bot's HTTP connections"""
+        await self.flush()
+        if self.bot is not None:
+            await self.bot.shutdown()
+    
     async def send_emergency_alert(self, message: str):
         """Send emergency alert to both channel and admin"""
         if not self.enabled:
@@ -308,32 +502,32 @@ Keep following the community for live trade updates!
 ⚠️ <b>System Alert:</b>
 {message}
 
-⏰ Time: {datetime.now(timezone.utc).strftime('%H:%M:%S UTC')}
+⏰ Time: {_utc_hms(int(time.time()))}
 
 Please check system status immediately!
 
 #Emergency #SystemAlert"""
         
-        try:
-            # Send to channel
-            await self.bot.send_message(
-                chat_id=self.channel_id,
-                text=alert_message,
-                parse_mode=ParseMode.HTML
-            )
-            
-            # Send to admin if configured
-            if self.admin_chat_id:
-                await self.bot.send_message(
-                    chat_id=self.admin_chat_id,
-                    text=alert_message,
-                    parse_mode=ParseMode.HTML
-                )
-            
-            logger.critical(f"🚨 Emergency alert sent via Telegram")
-            
-        except TelegramError as e:
-            logger.error(f"❌ Failed to send emergency alert: {e}")
+        # Send to channel and admin (if configured) concurrently; one failing doesn't stop the other
+        chat_ids = [self.channel_id]
+        if self.admin_chat_id:
+            chat_ids.append(self.admin_chat_id)
+        
+        results = await asyncio.gather(
+            *(self.bot.send_message(chat_id=chat_id, text=alert_message, parse_mode=_PARSE_MODE_HTML)
+              for chat_id in chat_ids),
+            return_exceptions=True
+        )
+        
+        sent = False
+        for chat_id, result in zip(chat_ids, results):
+            if isinstance(result, BaseException):
+                logger.error(f"❌ Failed to send emergency alert to {chat_id}: {result}")
+            else:
+                sent = True
+        
+        if sent:
+            logger.critical("🚨 Emergency alert sent via Telegram")
 
 # Global instance
 telegram_bot = TelegramCommunityBot()
@@ -341,6 +535,8 @@ telegram_bot = TelegramCommunityBot()
 # Helper functions for easy integration
 async def notify_trade_entry(asset: str, price: float, metadata: Dict[str, Any] = None):
     """Helper function to notify trade entry"""
+    if not telegram_bot.enabled:
+        return
     notification = TradingNotification(
         message_type='entry',
         asset=asset,
@@ -353,6 +549,8 @@ async def notify_trade_entry(asset: str, price: float, metadata: Dict[str, Any]
 
 async def notify_trade_exit(asset: str, price: float, metadata: Dict[str, Any] = None):
     """Helper function to notify trade exit"""
+    if not telegram_bot.enabled:
+        return
     notification = TradingNotification(
         message_type='exit',
         asset=asset,
@@ -367,6 +565,8 @@ async def notify_trade_exit(asset: str, price: float, metadata: Dict[str, Any] =
 async def notify_regime_change(asset: str, price: float, previous_regime: str, current_regime: str, 
                               ema_240: float, ema_600: float):
     """Helper function to notify regime change"""
+    if not telegram_bot.enabled:
+        return
     notification = TradingNotification(
         message_type='regime_change',
         asset=asset,
@@ -0,0 +1,23 @@
+"""
+Event loop setup - use uvloop when it is installed
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+def install_uvloop() -> bool:
+    """Make asyncio.run() use uvloop if available; call before the first asyncio.run()
+
+    Returns:
+        True if uvloop was installed, False if the default loop is used
+    """
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("uvloop not installed, using the default asyncio event loop")
+        return False
+
+    uvloop.install()
+    logger.info("⚡ uvloop event loop enabled")
+    return True
@@ -3,143 +3,295 @@
 Trade Duration Tracker - Extract trade durations from logs without exchange queries
 """
 
+import os
 import re
+import mmap
 import logging
-from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from collections import defaultdict
+from datetime import timezone
+
+import numpy as np
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Assets always reported, even without trades; others are picked up from the log
+DEFAULT_ASSETS = ('BTC', 'ETH', 'SOL')
+
+# Trade entry/exit log lines, matched with one scan per line. Logs are scanned
+# as raw bytes; only the captured groups are decoded.
+_ENTRY_MARKER = '🎯'.encode('utf-8')
+_EXIT_MARKER = '🏁'.encode('utf-8')
+TRADE_EVENT_RE = re.compile(
+    rb'(?P<ts>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}).*?'
+    rb'(?:' + _ENTRY_MARKER + rb' (?P<entry_asset>\w+): SHORT position opened at \$(?P<entry_price>[0-9,]+\.\d+)'
+    rb'|' + _EXIT_MARKER + rb' (?P<exit_asset>\w+): Position closed at \$(?P<exit_price>[0-9,]+\.\d+))'
+)
+
+def _new_event_columns() -> Dict[str, list]:
+    """Empty per-asset event columns, filled while parsing"""
+    return {'timestamp': [], 'price': [], 'is_entry': [], 'raw_line': []}
+
+def _new_event_cache() -> Dict[str, Dict[str, list]]:
+    """Per-asset event columns, with any asset found in the log added on first use"""
+    return defaultdict(_new_event_columns, {asset: _new_event_columns() for asset in DEFAULT_ASSETS})
+
+def _event_arrays(columns: Dict[str, list]) -> Dict[str, object]:
+    """Parsed event columns as NumPy arrays (timestamps as UTC datetime64[ms])
+    
+    Timestamps are collected as b'YYYY-MM-DD HH:MM:SS.mmm' and parsed by NumPy in one call.
+    """
+    return {
+        'timestamp': np.array(columns['timestamp'], dtype='datetime64[ms]'),
+        'price': np.array(columns['price'], dtype=np.float64),
+        'is_entry': np.array(columns['is_entry'], dtype=bool),
+        'raw_line': columns['raw_line']
+    }
+
+def _match_fifo(is_entry: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pair each exit with the oldest open entry (FIFO); exits with nothing open are ignored
+    
+    Returns the (entry, exit) indices of the completed trades, in exit order. Without
+    a loop: after event t, the trades completed so far are the exits so far, less any
+    exits that found no open entry, i.e. exits + min(0, running min of entries - exits).
+    An exit completes a trade when that count goes up, and the k-th completed trade
+    uses the k-th entry.
+    """
+    entries = np.cumsum(is_entry)
+    exits = np.arange(1, len(is_entry) + 1) - entries
+    completed = exits + np.minimum(np.minimum.accumulate(entries - exits), 0)
+    exit_idx = np.flatnonzero(np.diff(completed, prepend=0) > 0)
+    entry_idx = np.flatnonzero(is_entry)[:len(exit_idx)]
+    return entry_idx, exit_idx
+
+def format_duration(duration_s: int) -> str:
+    """Trade duration in whole seconds as e.g. '3h 25m'"""
+    return f"{duration_s // 3600}h {(duration_s % 3600) // 60}m"
+
+def _completed_trades(events: Dict[str, object]) -> Dict[str, np.ndarray]:
+    """Completed trade columns, in exit order, from one asset's event arrays"""
+    timestamps, prices, is_entry = events['timestamp'], events['price'], events['is_entry']
+    
+    # Log lines are normally already in time order; only sort when they aren't
+    if (timestamps[1:] < timestamps[:-1]).any():
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, prices, is_entry = timestamps[order], prices[order], is_entry[order]
+    
+    # Match entries with exits, oldest open entry first (FIFO)
+    entry_idx, exit_idx = _match_fifo(is_entry)
+    
+    entry_times, exit_times = timestamps[entry_idx], timestamps[exit_idx]
+    entry_prices, exit_prices = prices[entry_idx], prices[exit_idx]
+    return {
+        'entry_time': entry_times,
+        'exit_time': exit_times,
+        'entry_price': entry_prices,
+        'exit_price': exit_prices,
+        'duration_s': (exit_times - entry_times) // np.timedelta64(1, 's'),
+        'pnl_pct': (entry_prices - exit_prices) / entry_prices * 100
+    }
+
 class TradeDurationTracker:
     """Extract and track trade durations from log files"""
     
-    def __init__(self, log_file_path: str = None):
+    def __init__(self, log_file_path: str = None, keep_raw: bool = False):
+        """
+        Args:
+            log_file_path: Log to analyse; the latest logs/multi_asset_*.log if None
+            keep_raw: Keep each event's full log line (parse results' 'raw_line');
+                off by default as nothing here reads them
+        """
         self.log_file_path = log_file_path or self.find_latest_log_file()
+        self.keep_raw = keep_raw
+        
+        # Parse checkpoint: events read so far and the offset of the first unread line,
+        # so repeat parses only scan lines appended since the last call
+        self._log_id = None  # (path, device, inode) the checkpoint belongs to
+        self._last_offset = 0
+        self._events_cache = _new_event_cache()
+        
+        # Last get_trade_statistics result and the log file state it was computed from
+        self._stats_key = None
+        self._stats_cache: Optional[Dict[str, Dict]] = None
         
     def find_latest_log_file(self) -> str:
         """Find the most recent log file"""
-        log_dir = Path("logs")
-        if not log_dir.exists():
-            return None
-        
-        log_files = list(log_dir.glob("multi_asset_*.log"))
-        if not log_files:
+        try:
+            # scandir entries carry their file type from the directory listing,
+            # so only the candidate logs are stat'ed
+            with os.scandir("logs") as entries:
+                latest_log = max(
+                    (entry for entry in entries
+                     if entry.name.startswith("multi_asset_") and entry.name.endswith(".log") and entry.is_file()),
+                    key=lambda entry: entry.stat().st_mtime,
+                    default=None
+                )
+        except OSError:
             return None
         
-        # Get the most recent log file
-        latest_log = max(log_files, key=lambda f: f.stat().st_mtime)
-        return str(latest_log)
+        return latest_log.path if latest_log is not None else None
     
-    def parse_trade_events_from_logs(self) -> Dict[str, List[Dict]]:
-        """Parse trade entry/exit events from log files"""
+    def parse_trade_events_from_logs(self) -> Dict[str, Dict[str, object]]:
+        """Parse trade entry/exit events from log files
+        
+        Returns per-asset event columns in log order: 'timestamp' (datetime64[ms], UTC),
+        'price' (float64), 'is_entry' (bool; False for exits) and 'raw_line' (list of str,
+        empty unless the tracker was created with keep_raw=True).
+        
+        Only lines appended since the previous call are read; the file is re-read
+        from the start if it was replaced or truncated (log rotation).
+        """
         if not self.log_file_path or not Path(self.log_file_path).exists():
             logger.warning("Log file not found for trade duration analysis")
             return {}
         
-        trade_events = {'BTC': [], 'ETH': [], 'SOL': []}
-        
-        # Regex patterns for trade events
-        entry_pattern = r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}).*🎯 (\w+): SHORT position opened at \$([0-9,]+\.\d+)'
-        exit_pattern = r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}).*🏁 (\w+): Position closed at \$([0-9,]+\.\d+)'
+        event_search = TRADE_EVENT_RE.search
+        keep_raw = self.keep_raw
+        column_appends = {}  # asset as logged -> append methods of its columns
         
         try:
-            with open(self.log_file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    # Check for trade entries
-                    entry_match = re.search(entry_pattern, line)
-                    if entry_match:
-                        timestamp_str, asset, price = entry_match.groups()
-                        timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S,%f')
-                        timestamp = timestamp.replace(tzinfo=timezone.utc)
+            with open(self.log_file_path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                log_id = (self.log_file_path, stat.st_dev, stat.st_ino)
+                if log_id != self._log_id or stat.st_size < self._last_offset:
+                    self._reset_checkpoint()
+                    self._log_id = log_id
+                
+                trade_events = self._events_cache
+                if stat.st_size > self._last_offset:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        # A last line without a newline may still be being written; leave it for next time
+                        end = mm.rfind(b'\n', self._last_offset) + 1 or self._last_offset
+                        mm.seek(self._last_offset)
                         
-                        trade_events[asset].append({
-                            'type': 'entry',
-                            'timestamp': timestamp,
-                            'price': float(price.replace(',', '')),
-                            'raw_line': line.strip()
-                        })
-                    
-                    # Check for trade exits
-                    exit_match = re.search(exit_pattern, line)
-                    if exit_match:
-                        timestamp_str, asset, price = exit_match.groups()
-                        timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S,%f')
-                        timestamp = timestamp.replace(tzinfo=timezone.utc)
+                        for line in iter(mm.readline, b''):
+                            # Most lines are neither; a substring check is far cheaper than the regex
+                            if _ENTRY_MARKER not in line and _EXIT_MARKER not in line:
+                                continue
+                            
+                            if mm.tell() > end:
+                                break
+                            
+                            match = event_search(line)
+                            if not match:
+                                continue
+                            
+                            timestamp_str, entry_asset, entry_price, exit_asset, exit_price = match.groups()
+                            if entry_asset is not None:
+                                asset, price = entry_asset, entry_price
+                            else:
+                                asset, price = exit_asset, exit_price
+                            
+                            appends = column_appends.get(asset)
+                            if appends is None:
+                                columns = trade_events[asset.decode('ascii')]
+                                appends = column_appends[asset] = (
+                                    columns['timestamp'].append, columns['price'].append,
+                                    columns['is_entry'].append, columns['raw_line'].append
+                                )
+                            append_timestamp, append_price, append_is_entry, append_raw_line = appends
+                            
+                            # Kept as text; parsed in bulk into datetime64 when the arrays are built
+                            append_timestamp(timestamp_str.replace(b',', b'.'))
+                            append_price(float(price.translate(None, b',')))
+                            append_is_entry(entry_asset is not None)
+                            if keep_raw:
+                                append_raw_line(line.strip().decode('utf-8', 'replace'))
                         
-                        trade_events[asset].append({
-                            'type': 'exit',
-                            'timestamp': timestamp,
-                            'price': float(price.replace(',', '')),
-                            'raw_line': line.strip()
-                        })
+                        self._last_offset = end
                         
         except Exception as e:
             logger.error(f"Error parsing log file: {e}")
+            # Events up to the error are returned, but the next call starts over
+            trade_events = self._events_cache
+            self._reset_checkpoint()
         
-        return trade_events
+        return {asset: _event_arrays(columns) for asset, columns in trade_events.items()}
     
-    def calculate_completed_trade_durations(self) -> Dict[str, List[Dict]]:
-        """Calculate durations for completed trades from logs"""
+    def _reset_checkpoint(self):
+        """Forget parsed events so the log is read from the start"""
+        self._log_id = None
+        self._last_offset = 0
+        self._events_cache = _new_event_cache()
+    
+    def _completed_trade_columns(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """Completed trades per asset as NumPy columns, in exit order"""
         trade_events = self.parse_trade_events_from_logs()
-        completed_trades = {'BTC': [], 'ETH': [], 'SOL': []}
+        completed_trades = {}
         
-        for asset in trade_events:
-            events = sorted(trade_events[asset], key=lambda x: x['timestamp'])
-            
-            # Match entries with exits
-            open_positions = []
-            
-            for event in events:
-                if event['type'] == 'entry':
-                    open_positions.append(event)
-                elif event['type'] == 'exit' and open_positions:
-                    # Match with most recent entry (FIFO)
-                    entry_event = open_positions.pop(0)
-                    duration = event['timestamp'] - entry_event['timestamp']
-                    
-                    # Format duration
-                    total_seconds = int(duration.total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    
-                    completed_trades[asset].append({
-                        'entry_time': entry_event['timestamp'],
-                        'exit_time': event['timestamp'],
-                        'entry_price': entry_event['price'],
-                        'exit_price': event['price'],
-                        'duration': duration,
-                        'duration_formatted': f"{hours}h {minutes}m",
-                        'duration_hours': duration.total_seconds() / 3600,
-                        'pnl_pct': ((entry_event['price'] - event['price']) / entry_event['price']) * 100
-                    })
+        for asset, events in trade_events.items():
+            completed_trades[asset] = _completed_trades(events)
         
         return completed_trades
     
+    @staticmethod
+    def _trade_records(columns: Dict[str, np.ndarray], start: int = 0) -> List[Dict]:
+        """Trade dicts for the rows of completed trade columns from start onwards"""
+        rows = zip(*(columns[key][start:].tolist() for key in (
+            'entry_time', 'exit_time', 'entry_price', 'exit_price', 'duration_s', 'pnl_pct'
+        )))
+        
+        # Durations are whole seconds; format_duration() or duration_s / 3600 give other forms
+        return [
+            {
+                'entry_time': entry_time.replace(tzinfo=timezone.utc),
+                'exit_time': exit_time.replace(tzinfo=timezone.utc),
+                'entry_price': entry_price,
+                'exit_price': exit_price,
+                'duration_s': duration_s,
+                'pnl_pct': pnl_pct
+            }
+            for entry_time, exit_time, entry_price, exit_price, duration_s, pnl_pct in rows
+        ]
+    
+    def calculate_completed_trade_durations(self) -> Dict[str, List[Dict]]:
+        """Calculate durations for completed trades from logs"""
+        completed_trades = {asset: [] for asset in DEFAULT_ASSETS}
+        for asset, columns in self._completed_trade_columns().items():
+            completed_trades[asset] = self._trade_records(columns)
+        return completed_trades
+    
     def get_trade_statistics(self) -> Dict[str, Dict]:
-        """Get comprehensive trade duration statistics"""
-        completed_trades = self.calculate_completed_trade_durations()
-        stats = {}
+        """Get comprehensive trade duration statistics
         
-        for asset in completed_trades:
-            trades = completed_trades[asset]
-            if not trades:
+        The result is reused while the log file is unchanged (same inode, size and
+        modification time), so treat it as read-only.
+        """
+        try:
+            stat = os.stat(self.log_file_path) if self.log_file_path else None
+        except OSError:
+            stat = None
+        stats_key = None if stat is None else (
+            self.log_file_path, stat.st_ino, stat.st_size, stat.st_mtime_ns
+        )
+        if stats_key is not None and stats_key == self._stats_key:
+            return self._stats_cache
+        
+        stats = {asset: {'total_trades': 0} for asset in DEFAULT_ASSETS}
+        
+        for asset, trades in self._completed_trade_columns().items():
+            total_trades = len(trades['pnl_pct'])
+            if not total_trades:
                 stats[asset] = {'total_trades': 0}
                 continue
             
-            durations_hours = [trade['duration_hours'] for trade in trades]
-            pnl_pcts = [trade['pnl_pct'] for trade in trades]
+            # Each statistic is one vectorized pass; only the recent trades become dicts
+            durations_hours = trades['duration_s'] / 3600
+            pnl_pcts = trades['pnl_pct']
             
             stats[asset] = {
-                'total_trades': len(trades),
-                'avg_duration_hours': sum(durations_hours) / len(durations_hours),
-                'min_duration_hours': min(durations_hours),
-                'max_duration_hours': max(durations_hours),
-                'avg_pnl_pct': sum(pnl_pcts) / len(pnl_pcts),
-                'win_rate': len([pnl for pnl in pnl_pcts if pnl > 0]) / len(pnl_pcts) * 100,
-                'recent_trades': trades[-5:]  # Last 5 trades
+                'total_trades': total_trades,
+                'avg_duration_hours': float(durations_hours.mean()),
+                'min_duration_hours': float(durations_hours.min()),
+                'max_duration_hours': float(durations_hours.max()),
+                'avg_pnl_pct': float(pnl_pcts.mean()),
+                'win_rate': int(np.count_nonzero(pnl_pcts > 0)) / total_trades * 100,
+                'recent_trades': self._trade_records(trades, max(total_trades - 5, 0))  # Last 5 trades
             }
         
+        self._stats_key = stats_key
+        self._stats_cache = stats
         return stats
 
 def demo_trade_duration_tracking():
@@ -158,18 +310,22 @@ def demo_trade_duration_tracking():
     # Get completed trade statistics
     stats = tracker.get_trade_statistics()
     
-    for asset in ['BTC', 'ETH', 'SOL']:
-        print(f"\n📈 {asset} Trade Duration Statistics:")
+    # Build the report and write it in one go rather than a print per line
+    lines = []
+    for asset in stats:
+        lines.append(f"\n📈 {asset} Trade Duration Statistics:")
         if stats[asset]['total_trades'] == 0:
-            print("   No completed trades found")
+            lines.append("   No completed trades found")
             continue
             
-        print(f"   Total Trades: {stats[asset]['total_trades']}")
-        print(f"   Average Duration: {stats[asset]['avg_duration_hours']:.2f}h")
-        print(f"   Min Duration: {stats[asset]['min_duration_hours']:.2f}h")
-        print(f"   Max Duration: {stats[asset]['max_duration_hours']:.2f}h")
-        print(f"   Average P&L: {stats[asset]['avg_pnl_pct']:+.2f}%")
-        print(f"   Win Rate: {stats[asset]['win_rate']:.1f}%")
+        lines.append(f"   Total Trades: {stats[asset]['total_trades']}")
+        lines.append(f"   Average Duration: {stats[asset]['avg_duration_hours']:.2f}h")
+        lines.append(f"   Min Duration: {stats[asset]['min_duration_hours']:.2f}h")
+        lines.append(f"   Max Duration: {stats[asset]['max_duration_hours']:.2f}h")
+        lines.append(f"   Average P&L: {stats[asset]['avg_pnl_pct']:+.2f}%")
+        lines.append(f"   Win Rate: {stats[asset]['win_rate']:.1f}%")
+    
+    print("\n".join(lines))
 
 if __name__ == "__main__":
     demo_trade_duration_tracking()
\ No newline at end of file
@@ -7,12 +7,14 @@ import asyncio
 import sys
 import os
 from datetime import datetime, timezone
+import numpy as np
 
 # Add project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.settings import settings
 from src.exchange.bybit_client import BybitClient
+from src.utils.event_loop import install_uvloop
 from scripts.start_trading import MultiAssetTradingSystem
 
 async def test_5min_bar_timing():
@@ -21,46 +23,53 @@ async def test_5min_bar_timing():
     
     system = MultiAssetTradingSystem()
     
-    # Test next 5-minute close calculation
-    for i in range(5):
-        now = datetime.now(timezone.utc)
-        next_close = system.get_next_5min_close_time()
-        
-        print(f"Current time: {now.strftime('%H:%M:%S')}")
-        print(f"Next 5-min close: {next_close.strftime('%H:%M:%S')}")
-        print(f"Wait time: {(next_close - now).total_seconds():.0f} seconds")
-        print("---")
-        
-        # Simulate waiting a bit
-        await asyncio.sleep(1)
+    try:
+        # Test next 5-minute close calculation
+        for i in range(5):
+            now = datetime.now(timezone.utc)
+            next_close = system.get_next_5min_close_time()
+            
+            print(f"Current time: {now.strftime('%H:%M:%S')}")
+            print(f"Next 5-min close: {next_close.strftime('%H:%M:%S')}")
+            print(f"Wait time: {(next_close - now).total_seconds():.0f} seconds")
+            print("---")
+            
+            # Simulate waiting a bit
+            await asyncio.sleep(1)
+    finally:
+        await system.bybit_client.close()
 
 async def test_5min_bar_data():
     """Test 5-minute bar data retrieval and processing"""
     print("\n📊 Testing 5-minute bar data processing")
     
     client = BybitClient()
+    assets = ['BTC', 'ETH', 'SOL']
     
-    for asset in ['BTC', 'ETH', 'SOL']:
+    # Get 5-minute klines (last 20 bars) for all assets concurrently
+    results = await asyncio.gather(
+        *(client.get_klines(f"{asset}USDT", '5', 20) for asset in assets),
+        return_exceptions=True
+    )
+    
+    for asset, klines in zip(assets, results):
         try:
-            symbol = f"{asset}USDT"
-            
-            # Get 5-minute klines
-            klines = await client.get_klines(symbol, '5', 20)  # Get last 20 bars
+            if isinstance(klines, Exception):
+                raise klines
             
             print(f"\n{asset} - Last 5 bars (5-minute intervals):")
             print("Time                | Open      | High      | Low       | Close     | Volume")
             print("-" * 80)
             
-            for i, kline in enumerate(klines[:5]):  # Show first 5 (most recent)
-                timestamp = int(kline[0])
-                dt = datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc)
-                
-                print(f"{dt.strftime('%H:%M:%S %Y-%m-%d')} | "
-                      f"${float(kline[1]):8.2f} | "
-                      f"${float(kline[2]):8.2f} | "
-                      f"${float(kline[3]):8.2f} | "
-                      f"${float(kline[4]):8.2f} | "
-                      f"{float(kline[5]):8.0f}")
+            # Show first 5 (most recent), converting all fields in one pass
+            rows = np.array(klines[:5], dtype=np.float64).reshape(-1, 7)
+            times = rows[:, 0].astype(np.int64).astype('datetime64[ms]').astype(datetime)
+            
+            print("\n".join(
+                f"{dt.strftime('%H:%M:%S %Y-%m-%d')} | "
+                f"${o:8.2f} | ${h:8.2f} | ${l:8.2f} | ${c:8.2f} | {v:8.0f}"
+                for dt, (o, h, l, c, v) in zip(times, rows[:, 1:6].tolist())
+            ))
             
             # Verify 5-minute intervals
             if len(klines) >= 2:
@@ -77,6 +86,8 @@ async def test_5min_bar_data():
         except Exception as e:
             print(f"❌ Error processing {asset}: {e}")
 
+    await client.close()
+
 async def test_ema_calculation():
     """Test EMA calculation with 5-minute data"""
     print("\n📈 Testing EMA calculation with 5-minute bars")
@@ -110,6 +121,8 @@ async def test_ema_calculation():
             
     except Exception as e:
         print(f"❌ Error in EMA test: {e}")
+    finally:
+        await system.bybit_client.close()
 
 async def main():
     """Run all 5-minute bar tests"""
@@ -123,4 +136,5 @@ async def main():
     print("\n✅ All 5-minute bar tests completed!")
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main())
\ No newline at end of file
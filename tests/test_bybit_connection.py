@@ -12,6 +12,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.settings import settings
 from src.exchange.bybit_client import BybitClient
+from src.utils.event_loop import install_uvloop
 
 async def test_bybit_connection():
     """Test connection to Bybit demo API"""
@@ -55,8 +56,11 @@ async def test_bybit_connection():
     except Exception as e:
         print(f"❌ API Test Failed: {e}")
         return False
+    finally:
+        await client.close()
 
 if __name__ == "__main__":
+    install_uvloop()
     success = asyncio.run(test_bybit_connection())
     if not success:
         sys.exit(1)
\ No newline at end of file
@@ -17,6 +17,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.settings import settings
 from src.core.strategy_engine import MultiAssetStrategyEngine, MarketData, SignalType, TradingSignal
 from src.exchange.bybit_client import BybitClient
+from src.utils.event_loop import install_uvloop
 
 class LiveExchangeTester:
     def __init__(self):
@@ -33,22 +34,20 @@ class LiveExchangeTester:
         try:
             # Get account balance
             balance_info = await self.bybit_client.get_account_balance()
-            if balance_info and 'list' in balance_info:
-                for account in balance_info['list']:
-                    for coin in account.get('coin', []):
-                        if coin.get('coin') == 'USDT':
-                            balance = float(coin.get('walletBalance', 0))
-                            available = float(coin.get('equity', 0))
-                            
-                            print(f"💰 Demo Account Status:")
-                            print(f"   Total Balance: ${balance:,.2f} USDT")
-                            print(f"   Available Balance: ${available:,.2f} USDT")
-                            
-                            if balance < 1000:
-                                print(f"⚠️  WARNING: Low balance for testing")
-                                return False
-                            
-                            return True
+            usdt = BybitClient.get_coin_balance(balance_info, 'USDT')
+            if usdt is not None:
+                balance = float(usdt.get('walletBalance', 0))
+                available = float(usdt.get('equity', 0))
+                
+                print(f"💰 Demo Account Status:")
+                print(f"   Total Balance: ${balance:,.2f} USDT")
+                print(f"   Available Balance: ${available:,.2f} USDT")
+                
+                if balance < 1000:
+                    print(f"⚠️  WARNING: Low balance for testing")
+                    return False
+                
+                return True
             
             print("❌ Failed to get account balance")
             return False
@@ -200,8 +199,11 @@ class LiveExchangeTester:
         
         for i in range(monitor_duration):
             try:
-                # Get real position from exchange
-                positions = await self.bybit_client.get_positions(symbol)
+                # Get real position and current market price from exchange
+                positions, ticker = await asyncio.gather(
+                    self.bybit_client.get_positions(symbol),
+                    self.bybit_client.get_ticker(symbol)
+                )
                 current_position = None
                 
                 for pos in positions:
@@ -216,8 +218,6 @@ class LiveExchangeTester:
                     unrealized_pnl = float(current_position.get('unrealisedPnl', 0))
                     percentage = float(current_position.get('unrealisedPnlPcnt', 0)) * 100
                     
-                    # Get current market price
-                    ticker = await self.bybit_client.get_ticker(symbol)
                     current_price = float(ticker.get('lastPrice', avg_price))
                     
                     print(f"⏱️  {i+1:3d}s | {asset}: ${current_price:8.2f} | "
@@ -329,18 +329,16 @@ async def run_live_exchange_test():
     # Initialize demo account
     if not await tester.initialize_demo_account():
         print("❌ Demo account initialization failed")
+        await tester.bybit_client.close()
         return
     
     # Get account balance
     balance_info = await tester.bybit_client.get_account_balance()
     account_balance = 10000.0  # Default
     
-    if balance_info and 'list' in balance_info:
-        for account in balance_info['list']:
-            for coin in account.get('coin', []):
-                if coin.get('coin') == 'USDT':
-                    account_balance = float(coin.get('walletBalance', 10000))
-                    break
+    usdt = BybitClient.get_coin_balance(balance_info, 'USDT')
+    if usdt is not None:
+        account_balance = float(usdt.get('walletBalance', 10000))
     
     # Test with BTC (you can change this to ETH or SOL)
     test_asset = 'BTC'
@@ -378,15 +376,13 @@ async def run_live_exchange_test():
         print("-" * 30)
         
         final_balance_info = await tester.bybit_client.get_account_balance()
-        if final_balance_info and 'list' in final_balance_info:
-            for account in final_balance_info['list']:
-                for coin in account.get('coin', []):
-                    if coin.get('coin') == 'USDT':
-                        final_balance = float(coin.get('walletBalance', 0))
-                        pnl_change = final_balance - account_balance
-                        
-                        print(f"💰 Final Balance: ${final_balance:,.2f} USDT")
-                        print(f"💰 P&L Change: ${pnl_change:+.2f} USDT")
+        final_usdt = BybitClient.get_coin_balance(final_balance_info, 'USDT')
+        if final_usdt is not None:
+            final_balance = float(final_usdt.get('walletBalance', 0))
+            pnl_change = final_balance - account_balance
+            
+            print(f"💰 Final Balance: ${final_balance:,.2f} USDT")
+            print(f"💰 P&L Change: ${pnl_change:+.2f} USDT")
         
         print(f"\n✅ LIVE EXCHANGE TEST COMPLETED!")
         print(f"📋 This demonstrated:")
@@ -403,6 +399,8 @@ async def run_live_exchange_test():
         if test_asset in tester.active_positions:
             print(f"🚨 Emergency cleanup - closing position...")
             await tester.close_live_position(test_asset)
+    finally:
+        await tester.bybit_client.close()
 
 async def main():
     """Main function with countdown"""
@@ -425,4 +423,5 @@ async def main():
         print(f"\n❌ Test failed: {e}")
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main())
\ No newline at end of file
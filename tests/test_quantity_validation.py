@@ -6,7 +6,8 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from decimal import Decimal
+import random
+from decimal import Decimal, ROUND_DOWN
 from src.exchange.bybit_client import BybitClient
 
 def test_quantity_rounding():
@@ -152,7 +153,40 @@ def test_edge_cases():
         print(f"   Corrected Qty: {validation['corrected_qty']}")
         print(f"   Errors: {validation['errors']}")
 
+def test_rounding_matches_decimal_near_step_boundaries():
+    """round_quantity must floor to the step exactly like Decimal arithmetic does"""
+    client = BybitClient()
+    rng = random.Random(42)
+    
+    for qty_step in (0.001, 0.01, 0.1, 0.5, 1.0, 0.0001):
+        client.instrument_specs['TESTUSDT'] = {
+            'symbol': 'TESTUSDT',
+            'min_order_qty': 0.0,
+            'max_order_qty': 0.0,
+            'qty_step': qty_step,
+            'min_notional': 0.0,
+            'price_tick': 0.01,
+            'status': 'Trading'
+        }
+        step = Decimal(str(qty_step))
+        
+        for _ in range(5000):
+            boundary = rng.randint(1, 10_000_000) * qty_step
+            # Just below, on and just above a step boundary
+            for offset in (-4e-7, -4e-9, -1e-12, 0.0, 1e-12, 4e-9, 4e-7):
+                quantity = boundary + offset
+                if quantity <= 0:
+                    continue
+                expected = float((Decimal(str(quantity)) / step).quantize(Decimal('1'), rounding=ROUND_DOWN) * step)
+                assert client.round_quantity('TESTUSDT', quantity) == expected, (qty_step, quantity)
+    
+    # Regression: a value just below a step must not be rounded up to it
+    client.instrument_specs['TESTUSDT']['qty_step'] = 0.001
+    assert client.round_quantity('TESTUSDT', 678.5239996) == 678.523
+    assert client.round_quantity('TESTUSDT', 0.29) == 0.29
+
 if __name__ == "__main__":
     test_quantity_rounding()
     test_edge_cases()
+    test_rounding_matches_decimal_near_step_boundaries()
     print("\n✅ All tests completed!")
\ No newline at end of file
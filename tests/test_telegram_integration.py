@@ -13,6 +13,7 @@ from datetime import datetime, timezone
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.notifications.telegram_bot import telegram_bot, notify_trade_entry, notify_trade_exit, send_daily_report, notify_regime_change
+from src.utils.event_loop import install_uvloop
 
 async def test_telegram_integration():
     """Test all Telegram notification features"""
@@ -149,6 +150,9 @@ async def test_telegram_integration():
     except Exception as e:
         print(f"❌ Emergency alert failed: {e}")
     
+    # Notifications are sent by a background dispatcher; wait for the queue to drain
+    await telegram_bot.flush()
+    
     print("\n🎉 TELEGRAM INTEGRATION TEST COMPLETED!")
     print("Check your Telegram channel for all the test messages")
     print("\n📋 Message Types Tested:")
@@ -212,7 +216,14 @@ async def test_message_formatting():
     exit_message = telegram_bot.format_trade_exit_message(exit_notification)
     print(exit_message)
 
+async def run_all_tests():
+    """Run the format test, then the full integration test, in one event loop"""
+    await test_message_formatting()
+    print("\n" + "="*60)
+    await test_telegram_integration()
+
 if __name__ == "__main__":
+    install_uvloop()
     print("🤖 TELEGRAM INTEGRATION TEST SUITE")
     print("=" * 60)
     print("This will test all Telegram notification features")
@@ -229,8 +240,6 @@ if __name__ == "__main__":
     elif choice == "2":
         asyncio.run(test_message_formatting())
     elif choice == "3":
-        asyncio.run(test_message_formatting())
-        print("\n" + "="*60)
-        asyncio.run(test_telegram_integration())
+        asyncio.run(run_all_tests())
     else:
         print("Invalid choice. Exiting.")
\ No newline at end of file
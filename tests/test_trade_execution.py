@@ -16,6 +16,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.settings import settings
 from src.core.strategy_engine import MultiAssetStrategyEngine, MarketData, SignalType, TradingSignal, MarketRegime
 from src.exchange.bybit_client import BybitClient
+from src.utils.event_loop import install_uvloop
 
 class TestTradingSimulator:
     def __init__(self):
@@ -48,14 +49,15 @@ class TestTradingSimulator:
             timestamp=datetime.now(timezone.utc)
         )
     
-    def create_fake_exit_scenario(self, asset: str, entry_price: float, exit_type: str) -> float:
-        """Create fake exit price scenarios"""
+    def create_fake_exit_scenario(self, trade_details: Dict, exit_type: str) -> float:
+        """Create fake exit price scenarios from the targets set at entry"""
+        entry_price = trade_details['entry_price']
         if exit_type == "take_profit":
             # 6% profit (price dropped 6% from entry)
-            return entry_price * (1 - settings.risk.take_profit_pct)
+            return trade_details['take_profit']
         elif exit_type == "stop_loss":
             # 1.5% loss (price rose 1.5% from entry)  
-            return entry_price * (1 + settings.risk.stop_loss_pct)
+            return trade_details['stop_loss']
         elif exit_type == "time_exit":
             # Random exit after time limit
             return entry_price * 0.98  # Small profit
@@ -167,7 +169,7 @@ class TestTradingSimulator:
         print("=" * 60)
         
         # Calculate exit price
-        exit_price = self.create_fake_exit_scenario(asset, entry_price, exit_type)
+        exit_price = self.create_fake_exit_scenario(trade_details, exit_type)
         
         # Calculate P&L (for short position: profit when price goes down)
         price_change = entry_price - exit_price  # Positive = profit for short
@@ -298,5 +300,8 @@ async def run_trade_simulation_tests():
     print(f"\n✅ Trade execution simulation completed successfully!")
     print(f"📝 This demonstrates the complete flow from signal generation to position management")
 
+    await simulator.bybit_client.close()
+
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(run_trade_simulation_tests())
\ No newline at end of file